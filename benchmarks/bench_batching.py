@@ -0,0 +1,33 @@
+"""Per-page readtext calls against batched detection and recognition."""
+import shutil
+
+import pytest
+
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+# (recognizer batch_size, page_batch_size)
+SETTINGS = [(1, 1), (8, 1), (32, 1), (8, 4), (32, 8)]
+
+
+@pytest.mark.parametrize('page_batch_size', [1, 4, 16])
+def test_batched_matches_per_page(stub_eu, pdf_factory, page_batch_size):
+    pdf_fp = pdf_factory(pages=8, lines=5)
+    expected = stub_eu(page_cache=False).scan_detections(pdf_fp)
+    detections = stub_eu(page_cache=False, page_batch_size=page_batch_size).scan_detections(pdf_fp)
+    assert list(detections.texts) == list(expected.texts)
+    assert (detections.coords == expected.coords).all()
+
+
+@pytest.mark.parametrize('batch_size,page_batch_size', SETTINGS)
+def test_cpu_throughput(benchmark, tmp_path, monkeypatch, pdf_factory, batch_size, page_batch_size):
+    pytest.importorskip('easyocr', reason='the real OCR models are needed to measure throughput')
+    from easyocr_unstructured import EasyocrUnstructured
+
+    monkeypatch.chdir(tmp_path)
+    pdf_fp = pdf_factory(pages=8, lines=20)
+    eu = EasyocrUnstructured(gpu=False, page_cache=False, batch_size=batch_size,
+                             page_batch_size=page_batch_size)
+    eu.warm_up()
+    benchmark.extra_info['pages'] = 8
+    benchmark.pedantic(eu.scan_detections, args=(pdf_fp,), rounds=2)
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+from layouts import text_lines
+
+COUNTS = [1000, 10000, 100000]
+
+
+@pytest.fixture(scope='module')
+def eu():
+    # the cache methods don't need the cache directory the constructor creates
+    return EasyocrUnstructured.__new__(EasyocrUnstructured)
+
+
+def load_json(cache_fp):
+    with open(cache_fp, 'r') as f:
+        return Detections.from_entries(json.load(f))
+
+
+@pytest.mark.parametrize('count', COUNTS)
+def test_json_cache_hit(benchmark, tmp_path, count):
+    entries = text_lines(count)
+    cache_fp = str(tmp_path / 'doc.txt')
+    with open(cache_fp, 'w') as f:
+        json.dump(entries, f)
+    benchmark.extra_info['boxes'] = count
+    assert benchmark(load_json, cache_fp).to_entries() == entries
+
+
+@pytest.mark.parametrize('count', COUNTS)
+def test_binary_cache_hit(benchmark, eu, tmp_path, count):
+    entries = text_lines(count)
+    cache_fp = str(tmp_path / 'doc.npy')
+    eu.write_cache(Detections.from_entries(entries), cache_fp)
+    benchmark.extra_info['boxes'] = count
+    assert benchmark(eu.read_cache, cache_fp).to_entries() == entries
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from easyocr_unstructured import EasyocrUnstructured
+
+COUNTS = [1000, 10000, 100000]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    # the cache directory is relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    cache_dir = tmp_path / 'tmp' / 'easyocr_unstructured'
+    cache_dir.mkdir(parents=True)
+    return cache_dir
+
+
+def fill(cache_dir, count):
+    for i in range(count):
+        with open(os.path.join(cache_dir, f'{i:040x}.npy'), 'wb') as f:
+            f.write(b'\0' * 128)
+
+
+@pytest.mark.parametrize('count', COUNTS)
+def test_construction(benchmark, cache_dir, count):
+    fill(cache_dir, count)
+    # index the existing files once, as the first cache access after an upgrade would
+    EasyocrUnstructured().cache_index.total_size()
+    benchmark.extra_info['cached_documents'] = count
+    benchmark(EasyocrUnstructured)
+
+
+@pytest.mark.parametrize('count', COUNTS)
+def test_mtime_sweep(benchmark, cache_dir, count):
+    # what every construction used to cost
+    fill(cache_dir, count)
+    eu = EasyocrUnstructured()
+    benchmark.extra_info['cached_documents'] = count
+    benchmark(eu.delete_old_files, str(cache_dir), 7)
+
+
+@pytest.mark.parametrize('policy', ['lru', 'lfu'])
+def test_eviction_after_write(benchmark, cache_dir, policy):
+    fill(cache_dir, 10000)
+    eu = EasyocrUnstructured(cache_policy=policy, cache_max_bytes=128 * 9000)
+    # bring the cache within budget so each timed write evicts about one file
+    eu.cache_index.evict()
+
+    def write():
+        write.count += 1
+        new_fp = str(cache_dir / f'new{write.count}.npy')
+        with open(new_fp, 'wb') as f:
+            f.write(b'\0' * 128)
+        eu.cache_index.record_write(new_fp)
+    write.count = 0
+    benchmark(write)
+    assert eu.cache_index.total_size() <= 128 * 9000
@@ -0,0 +1,27 @@
+import pytest
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+from layouts import scattered_labels
+
+
+def readtext_output(count):
+    # easyocr returns float corner points for rotated or merged boxes
+    return [([[x + 0.5, y + 0.25] for x, y in entry[:4]], entry[4], 0.875)
+            for entry in scattered_labels(count)]
+
+
+@pytest.mark.parametrize('count', [1000, 10000, 50000])
+def test_get_new_entry(benchmark, count):
+    eu = EasyocrUnstructured.__new__(EasyocrUnstructured)
+    detections = readtext_output(count)
+    benchmark.extra_info['boxes'] = count
+    benchmark(lambda: [eu.get_new_entry(entry) for entry in detections])
+
+
+@pytest.mark.parametrize('count', [1000, 10000, 50000])
+def test_detections_from_readtext(benchmark, count):
+    eu = EasyocrUnstructured.__new__(EasyocrUnstructured)
+    detections = readtext_output(count)
+    benchmark.extra_info['boxes'] = count
+    columnar = benchmark(Detections.from_readtext, detections)
+    assert columnar.to_entries() == [eu.get_new_entry(entry) for entry in detections]
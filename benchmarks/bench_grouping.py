@@ -0,0 +1,36 @@
+"""Grouping time by layout and box count, against the recursive grouping it replaced."""
+import copy
+import sys
+
+import pytest
+
+from easyocr_unstructured import EasyocrUnstructured
+from layouts import LAYOUTS
+from tests.test_grouping import reference_process_entries
+
+
+@pytest.fixture(scope='module')
+def eu():
+    # grouping doesn't touch the cache, so skip creating the cache directory
+    return EasyocrUnstructured.__new__(EasyocrUnstructured)
+
+
+@pytest.mark.parametrize('count', [100, 1000, 10000, 100000])
+@pytest.mark.parametrize('layout', sorted(LAYOUTS))
+def test_grouping_scaling(benchmark, eu, layout, count):
+    entries = LAYOUTS[layout](count)
+    benchmark.extra_info['boxes'] = count
+    benchmark.pedantic(eu.process_entries, args=(entries, 20), rounds=3)
+
+
+@pytest.mark.parametrize('count', [100, 1000, 3000])
+@pytest.mark.parametrize('layout', sorted(LAYOUTS))
+def test_reference_scaling(benchmark, eu, layout, count):
+    entries = LAYOUTS[layout](count)
+    benchmark.extra_info['boxes'] = count
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, count + 100))
+    try:
+        benchmark.pedantic(lambda: reference_process_entries(eu, copy.deepcopy(entries), 20), rounds=1)
+    finally:
+        sys.setrecursionlimit(limit)
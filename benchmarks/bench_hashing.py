@@ -0,0 +1,47 @@
+import hashlib
+import os
+
+import pytest
+
+from easyocr_unstructured import EasyocrUnstructured
+
+SIZES_MB = [16, 128]
+HASHERS = {
+    'sha1-4k': dict(hasher='sha1', hash_buffer_size=4096),
+    'sha1-1m': dict(hasher='sha1'),
+    'blake2b-1m': dict(hasher='blake2b'),
+    'blake2b-mmap': dict(hasher='blake2b', hash_mmap=True),
+}
+
+
+@pytest.fixture
+def pdf_of_size(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def make(size_mb):
+        path = tmp_path / f'{size_mb}.pdf'
+        with open(path, 'wb') as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1 << 20))
+        return str(path)
+    return make
+
+
+@pytest.mark.parametrize('size_mb', SIZES_MB)
+@pytest.mark.parametrize('name', sorted(HASHERS))
+def test_hash_file(benchmark, pdf_of_size, name, size_mb):
+    pdf_fp = pdf_of_size(size_mb)
+    eu = EasyocrUnstructured(trust_file_stat=False, **HASHERS[name])
+    benchmark.extra_info['mb'] = size_mb
+    digest = benchmark(eu.get_hash, pdf_fp)
+    with open(pdf_fp, 'rb') as f:
+        assert digest == hashlib.new(HASHERS[name]['hasher'], f.read()).hexdigest()
+
+
+@pytest.mark.parametrize('size_mb', SIZES_MB)
+def test_unchanged_file(benchmark, pdf_of_size, size_mb):
+    pdf_fp = pdf_of_size(size_mb)
+    eu = EasyocrUnstructured()
+    eu.get_hash(pdf_fp)
+    benchmark.extra_info['mb'] = size_mb
+    benchmark(eu.get_hash, pdf_fp)
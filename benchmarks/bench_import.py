@@ -0,0 +1,49 @@
+"""Import time of the module, and the heavy dependencies each code path loads."""
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ['easyocr', 'torch', 'torchvision', 'cv2', 'skimage', 'pdf2image']
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'easyocr_unstructured')
+
+# Serve a cached document and group entries, then report which heavy modules got imported
+CACHE_HIT_SCRIPT = '''
+import json, sys
+from easyocr_unstructured import EasyocrUnstructured, Detections
+from layouts import text_lines
+pdf_fp = sys.argv[1]
+eu = EasyocrUnstructured(cache_dir=sys.argv[2])
+eu.store_detections(Detections.from_entries(text_lines(500)), eu.get_hash(pdf_fp))
+eu.invoke(pdf_fp)
+eu.process_entries(text_lines(500), 20)
+print(json.dumps(sorted(name for name in json.loads(sys.argv[3]) if name in sys.modules)))
+'''
+
+
+def run_python(*args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([MODULE_DIR, BENCH_DIR, env.get('PYTHONPATH', '')])
+    # run from the module directory so the package directory of the same name isn't imported
+    return subprocess.run([sys.executable, *args], check=True, capture_output=True, text=True,
+                          env=env, cwd=MODULE_DIR).stdout
+
+
+def test_import_time(benchmark):
+    # a fresh interpreter each round, so nothing is already imported
+    benchmark.pedantic(run_python, args=('-c', 'from easyocr_unstructured import EasyocrUnstructured'),
+                       rounds=5)
+    loaded = json.loads(run_python('-c', 'import json, sys; from easyocr_unstructured import EasyocrUnstructured; '
+                                         f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))'))
+    assert loaded == []
+
+
+def test_cache_hit_imports(tmp_path):
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 cached document')
+    loaded = json.loads(run_python('-c', CACHE_HIT_SCRIPT, pdf_fp, str(tmp_path / 'cache'),
+                                   json.dumps(HEAVY_MODULES)).splitlines()[-1])
+    assert loaded == []
@@ -0,0 +1,68 @@
+"""Accuracy against throughput for the inference profiles, on CPU."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('easyocr', reason='the real OCR models are needed to measure accuracy')
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+PROFILES = {
+    'default': 'default',
+    'fp32': 'fp32',
+    'cpu': 'cpu',
+    'cpu-1-thread': {'quantize': True, 'threads': 1, 'interop_threads': 1, 'inference_mode': True,
+                     'channels_last': True},
+}
+
+# (pages, lines, page size) of each document of the fixture set
+FIXTURES = [(2, 10, (1275, 1650)), (1, 30, (1275, 1650)), (2, 5, (2550, 3300))]
+
+# Run each profile in a fresh interpreter, as torch's thread counts can only be set once per
+# process. Every document is scanned once to load the models and once more to time it
+SCAN_SCRIPT = '''
+import json, sys, time
+from easyocr_unstructured import EasyocrUnstructured
+profile = json.loads(sys.argv[1])
+eu = EasyocrUnstructured(gpu=False, page_cache=False, inference_profile=profile)
+eu.warm_up()
+results = []
+for pdf_fp in sys.argv[2:]:
+    eu.scan_detections(pdf_fp)
+    start = time.perf_counter()
+    detections = eu.scan_detections(pdf_fp)
+    results.append({'seconds': time.perf_counter() - start, 'texts': [str(text) for text in detections.texts]})
+print(json.dumps(results))
+'''
+
+
+def scan_fixtures(profile, pdf_fps):
+    bench_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.join(os.path.dirname(bench_dir), 'easyocr_unstructured'),
+                                         env.get('PYTHONPATH', '')])
+    output = subprocess.run([sys.executable, '-c', SCAN_SCRIPT, json.dumps(profile), *pdf_fps],
+                            check=True, capture_output=True, text=True, env=env).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize('name', list(PROFILES))
+def test_inference_profile(benchmark, tmp_path, monkeypatch, pdf_factory, name):
+    from conftest import expected_words
+
+    monkeypatch.chdir(tmp_path)
+    pdf_fps = [pdf_factory(f'doc{i}.pdf', pages=pages, lines=lines, size=size)
+               for i, (pages, lines, size) in enumerate(FIXTURES)]
+    results = benchmark.pedantic(scan_fixtures, args=(PROFILES[name], pdf_fps), rounds=1)
+    found = expected = 0
+    for (pages, lines, _), result in zip(FIXTURES, results):
+        words = expected_words(pages, lines)
+        found += len(words & {word.lower() for text in result['texts'] for word in text.split()})
+        expected += len(words)
+    total_pages = sum(pages for pages, _, _ in FIXTURES)
+    benchmark.extra_info['accuracy'] = found / expected
+    benchmark.extra_info['pages_per_second'] = total_pages / sum(result['seconds'] for result in results)
@@ -0,0 +1,28 @@
+import pytest
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+from layouts import text_lines
+
+
+@pytest.fixture
+def cached_pdf(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 cached document')
+    eu = EasyocrUnstructured()
+    eu.store_detections(Detections.from_entries(text_lines(2000)), eu.get_hash(pdf_fp))
+    return pdf_fp
+
+
+@pytest.mark.parametrize('metrics', [False, True], ids=['disabled', 'enabled'])
+def test_cache_hit_overhead(benchmark, cached_pdf, metrics):
+    # read and group the OCR cache on every call rather than reuse a grouped result
+    eu = EasyocrUnstructured(metrics=metrics, memory_cache_bytes=0, cache_groups=False)
+    benchmark(eu.invoke, cached_pdf)
+
+
+def test_cache_hit_report(benchmark, cached_pdf):
+    eu = EasyocrUnstructured(memory_cache_bytes=0, cache_groups=False)
+    result = benchmark(eu.invoke, cached_pdf, report=True)
+    assert result.report['counters']['cache_hits'] == 1
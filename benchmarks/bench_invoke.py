@@ -0,0 +1,129 @@
+import io
+import os
+import shutil
+
+import pytest
+
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+PAGE_COUNTS = [1, 4, 16, 64]
+
+
+def clear_cache(eu):
+    # remove the cached results but keep the index the object has open
+    eu.memory_cache.clear()
+    for root, _, filenames in os.walk(eu.output_dir):
+        for filename in filenames:
+            if filename.endswith((eu.CACHE_EXTENSION, '.json')):
+                os.remove(os.path.join(root, filename))
+
+
+def drop_document_cache(eu, pdf_fp):
+    # keep the page cache but remove the document's OCR and grouped results
+    hash_value = eu.get_hash(pdf_fp)
+    eu.memory_cache.clear()
+    os.remove(eu.get_cache_path(hash_value))
+    os.remove(eu.get_groups_path(hash_value, 20))
+
+
+@pytest.mark.parametrize('pages', PAGE_COUNTS)
+def test_cache_miss(benchmark, stub_eu, pdf_factory, pages):
+    pdf_fp = pdf_factory(pages=pages, lines=10)
+    eu = stub_eu()
+    benchmark.extra_info['pages'] = pages
+    # a miss at both the document and the page level
+    benchmark.pedantic(eu.invoke, args=(pdf_fp,), setup=lambda: clear_cache(eu), rounds=3)
+
+
+@pytest.mark.parametrize('pages', PAGE_COUNTS)
+def test_page_cache_hit(benchmark, stub_eu, pdf_factory, pages):
+    pdf_fp = pdf_factory(pages=pages, lines=10)
+    eu = stub_eu()
+    eu.invoke(pdf_fp)
+    benchmark.extra_info['pages'] = pages
+    # the document is rasterized again but every page comes from the page cache
+    benchmark.pedantic(eu.invoke, args=(pdf_fp,), setup=lambda: drop_document_cache(eu, pdf_fp), rounds=3)
+
+
+# where a repeat call finds its result: the in-memory tier, the grouped result on disk, or
+# only the OCR cache on disk, grouped again
+CACHE_TIERS = {'memory': {}, 'groups': {'memory_cache_bytes': 0},
+               'detections': {'memory_cache_bytes': 0, 'cache_groups': False}}
+
+
+@pytest.mark.parametrize('tier', list(CACHE_TIERS))
+@pytest.mark.parametrize('pages', PAGE_COUNTS)
+def test_cache_hit(benchmark, stub_eu, pdf_factory, pages, tier):
+    pdf_fp = pdf_factory(pages=pages, lines=10)
+    eu = stub_eu(**CACHE_TIERS[tier])
+    expected = eu.invoke(pdf_fp)
+    benchmark.extra_info['pages'] = pages
+    assert benchmark(eu.invoke, pdf_fp) == expected
+
+
+def test_proximity_sweep(benchmark, stub_eu, pdf_factory):
+    # a review UI sweeping the proximity over a hot document
+    pdf_fp = pdf_factory(pages=16, lines=10)
+    eu = stub_eu()
+    proximities = list(range(0, 60, 5))
+    for proximity in proximities:
+        eu.invoke(pdf_fp, proximity)
+    benchmark(lambda: [eu.invoke(pdf_fp, proximity) for proximity in proximities])
+
+
+@pytest.mark.parametrize('chunk_size', [None, 4])
+def test_streaming_scan(benchmark, stub_eu, pdf_factory, chunk_size):
+    pdf_fp = pdf_factory(pages=16, lines=10)
+    eu = stub_eu(page_cache=False, page_chunk_size=chunk_size)
+    benchmark.pedantic(eu.scan_detections, args=(pdf_fp,), rounds=3)
+
+
+def first_page(eu, pdf_fp):
+    groups = eu.iter_groups(pdf_fp)
+    try:
+        return next(groups)
+    finally:
+        groups.close()
+
+
+@pytest.mark.parametrize('pages', PAGE_COUNTS)
+def test_time_to_first_page(benchmark, stub_eu, pdf_factory, pages):
+    pdf_fp = pdf_factory(pages=pages, lines=10)
+    eu = stub_eu(page_chunk_size=1)
+    benchmark.extra_info['pages'] = pages
+    # stays flat as the page count grows, unlike a cache miss of invoke
+    page_number, _ = benchmark.pedantic(first_page, args=(eu, pdf_fp), setup=lambda: clear_cache(eu), rounds=3)
+    assert page_number == 1
+
+
+SELECTIONS = {'all-pages': {}, 'first-page': {'pages': [1]},
+              'header-region': {'pages': [1], 'regions': [(0, 0, 1275, 300)]}}
+
+
+@pytest.mark.parametrize('selection', list(SELECTIONS))
+def test_selection_cache_miss(benchmark, stub_eu, pdf_factory, selection):
+    pdf_fp = pdf_factory(pages=16, lines=10)
+    eu = stub_eu()
+    benchmark.pedantic(eu.invoke, args=(pdf_fp,), kwargs=SELECTIONS[selection],
+                       setup=lambda: clear_cache(eu), rounds=3)
+
+
+# the same document passed as a path, as bytes already in memory, and as a file object
+INPUT_FORMS = {'path': lambda pdf_fp, data: pdf_fp, 'bytes': lambda pdf_fp, data: data,
+               'file-object': lambda pdf_fp, data: io.BytesIO(data)}
+
+
+@pytest.mark.parametrize('form', list(INPUT_FORMS))
+def test_input_form_cache_miss(benchmark, stub_eu, pdf_factory, form):
+    pdf_fp = pdf_factory(pages=16, lines=10)
+    with open(pdf_fp, 'rb') as f:
+        data = f.read()
+    eu = stub_eu(trust_file_stat=False)
+    expected = eu.invoke(pdf_fp)
+    # every form shares the cache of the file
+    assert eu.get_hash(data) == eu.get_hash(pdf_fp)
+    make_input = INPUT_FORMS[form]
+    result = benchmark.pedantic(lambda: eu.invoke(make_input(pdf_fp, data)), setup=lambda: clear_cache(eu),
+                                rounds=3)
+    assert result == expected
@@ -0,0 +1,33 @@
+import json
+import shutil
+
+import pytest
+
+pytest.importorskip('easyocr')
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+from easyocr_unstructured import EasyocrUnstructured
+
+PAGES = 8
+
+
+@pytest.fixture(scope='module')
+def serial_entries(tmp_path_factory):
+    from conftest import make_pdf
+    pdf_path = make_pdf(str(tmp_path_factory.mktemp('parallel') / 'doc.pdf'), pages=PAGES, lines=10)
+    eu = EasyocrUnstructured(gpu=False, page_cache=False, cache_dir=str(tmp_path_factory.mktemp('cache')))
+    return pdf_path, eu.scan_pdf(pdf_path)
+
+
+@pytest.mark.parametrize('workers', [1, 2, 4])
+def test_parallel_scan(benchmark, tmp_path, serial_entries, workers):
+    pdf_path, expected = serial_entries
+    # without the page cache every run OCRs every page, instead of reading earlier results
+    eu = EasyocrUnstructured(gpu=False, workers=workers, page_cache=False, cache_dir=str(tmp_path / 'cache'))
+    # start the pool and load the worker readers outside of the timed runs
+    eu.scan_pdf(pdf_path)
+    entries = benchmark.pedantic(eu.scan_pdf, args=(pdf_path,), rounds=3)
+    eu.close()
+    benchmark.extra_info['pages'] = PAGES
+    assert json.dumps(entries) == json.dumps(expected)
@@ -0,0 +1,27 @@
+"""Wall-clock time of a scan with and without rendering pages ahead of the OCR."""
+import shutil
+
+import pytest
+
+pytest.importorskip('pdf2image')
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+PAGES = 12
+# seconds the stub reader spends per page, roughly what rendering a page at 200 dpi costs so
+# neither stage hides the other
+OCR_DELAY = 0.1
+
+
+@pytest.mark.parametrize('prefetch_pages', [0, 1, 2, 4])
+def test_prefetch(benchmark, stub_eu, pdf_factory, prefetch_pages):
+    from stub_reader import StubReader
+
+    pdf_fp = pdf_factory(pages=PAGES, lines=10)
+    eu = stub_eu(StubReader(delay=OCR_DELAY), page_cache=False, page_chunk_size=1,
+                 prefetch_pages=prefetch_pages, metrics=True)
+    benchmark.pedantic(eu.scan_detections, args=(pdf_fp,), rounds=3)
+    timings = eu.metrics.report()['timings']
+    rounds = timings['rasterize']['count'] / PAGES
+    benchmark.extra_info['rasterize_seconds'] = timings['rasterize']['seconds'] / rounds
+    benchmark.extra_info['readtext_seconds'] = timings['readtext']['seconds'] / rounds
@@ -0,0 +1,36 @@
+import shutil
+import time
+
+import pytest
+
+easyocr = pytest.importorskip('easyocr')
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+from easyocr_unstructured import EasyocrUnstructured
+
+DOCUMENTS = 5
+
+
+def scan_sequence(pdf_paths, reuse_reader, cache_dir):
+    # the documents have the same pages, so the page cache would skip OCR after the first
+    eu = EasyocrUnstructured(page_cache=False, cache_dir=cache_dir)
+    latencies = []
+    for pdf_path in pdf_paths:
+        if not reuse_reader:
+            # what every scan_pdf call used to pay: a freshly loaded reader
+            EasyocrUnstructured.release_readers()
+        start = time.perf_counter()
+        eu.scan_pdf(pdf_path)
+        latencies.append(round(time.perf_counter() - start, 4))
+    return latencies
+
+
+@pytest.mark.parametrize('reuse_reader', [False, True], ids=['reader-per-call', 'pooled-reader'])
+def test_per_document_latency(benchmark, tmp_path, pdf_factory, reuse_reader):
+    pdf_paths = [pdf_factory(f'doc{i}.pdf', pages=1, lines=5) for i in range(DOCUMENTS)]
+    EasyocrUnstructured.release_readers()
+    latencies = benchmark.pedantic(scan_sequence, args=(pdf_paths, reuse_reader, str(tmp_path / 'cache')),
+                                   rounds=1)
+    benchmark.extra_info['latency_per_document'] = latencies
+    EasyocrUnstructured.release_readers()
@@ -0,0 +1,34 @@
+"""Accuracy against throughput for the render resolution, grayscale and adaptive DPI."""
+import shutil
+
+import pytest
+
+pytest.importorskip('easyocr', reason='the real OCR models are needed to measure accuracy')
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+SETTINGS = {
+    'dpi100': {'dpi': 100},
+    'dpi150': {'dpi': 150},
+    'dpi200': {'dpi': 200},
+    'dpi300': {'dpi': 300},
+    'dpi200-gray': {'dpi': 200, 'grayscale': True},
+    'adaptive100-200': {'dpi': 200, 'adaptive_dpi': 100},
+    'adaptive100-200-gray': {'dpi': 200, 'adaptive_dpi': 100, 'grayscale': True},
+}
+
+
+@pytest.mark.parametrize('name', list(SETTINGS))
+def test_render_settings(benchmark, tmp_path, monkeypatch, pdf_factory, name):
+    from conftest import expected_words
+    from easyocr_unstructured import EasyocrUnstructured
+
+    monkeypatch.chdir(tmp_path)
+    pdf_fp = pdf_factory(pages=2, lines=10)
+    eu = EasyocrUnstructured(gpu=False, page_cache=False, **SETTINGS[name])
+    eu.warm_up()
+    detections = benchmark.pedantic(eu.scan_detections, args=(pdf_fp,), rounds=2)
+    found = {word.lower() for text in detections.texts for word in text.split()}
+    expected = expected_words(2, 10)
+    benchmark.extra_info['accuracy'] = len(found & expected) / len(expected)
+    benchmark.extra_info['detections'] = len(detections)
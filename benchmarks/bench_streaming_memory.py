@@ -0,0 +1,46 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('pdf2image')
+if shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to rasterize PDFs', allow_module_level=True)
+
+PAGE_COUNTS = [8, 32, 128]
+
+# Run each scan in a fresh interpreter so ru_maxrss only reflects that scan
+SCAN_SCRIPT = '''
+import json, resource, sys
+from easyocr_unstructured import EasyocrUnstructured
+from stub_reader import install_stub_reader
+install_stub_reader(EasyocrUnstructured)
+chunk_size = json.loads(sys.argv[2])
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+EasyocrUnstructured(page_chunk_size=chunk_size, page_cache=False, cache_dir=sys.argv[3]).scan_pdf(sys.argv[1])
+print(json.dumps(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before))
+'''
+
+
+def peak_rss_kb(pdf_path, chunk_size, cache_dir):
+    bench_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.join(os.path.dirname(bench_dir), 'easyocr_unstructured'),
+                                         bench_dir, env.get('PYTHONPATH', '')])
+    output = subprocess.run([sys.executable, '-c', SCAN_SCRIPT, pdf_path, json.dumps(chunk_size), cache_dir],
+                            check=True, capture_output=True, text=True, env=env).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize('chunk_size', [None, 4], ids=['all-pages', 'streaming'])
+def test_peak_memory_by_page_count(benchmark, tmp_path, pdf_factory, chunk_size):
+    pdf_paths = {pages: pdf_factory(f'doc{pages}.pdf', pages=pages, lines=5) for pages in PAGE_COUNTS}
+    peaks = benchmark.pedantic(lambda: {pages: peak_rss_kb(pdf_path, chunk_size, str(tmp_path / 'cache'))
+                                        for pages, pdf_path in pdf_paths.items()}, rounds=1)
+    benchmark.extra_info['peak_rss_growth_kb'] = peaks
+    if chunk_size:
+        # streaming must not grow with the document, allow some slack for allocator noise
+        assert peaks[PAGE_COUNTS[-1]] < peaks[PAGE_COUNTS[0]] * 1.5 + 20000
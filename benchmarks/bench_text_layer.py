@@ -0,0 +1,66 @@
+"""Scanning born-digital PDFs from their text layer against rasterizing and OCRing them."""
+import shutil
+
+import pytest
+
+if shutil.which('pdftotext') is None or shutil.which('pdftoppm') is None:
+    pytest.skip('poppler is required to read and rasterize PDFs', allow_module_level=True)
+
+
+def make_text_pdf(path, pages=1, lines=20):
+    """
+    Write a born-digital PDF, with real text objects, in the same layout as make_pdf.
+
+    Args:
+        path (str): Where to write the PDF.
+        pages (int): The number of pages.
+        lines (int): The number of text lines per page.
+
+    Returns:
+        str: The path of the written PDF.
+    """
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for page in range(pages):
+        text = ''.join(f'BT /F1 10 Tf 48 {792 - 40 - line * 34} Td '
+                       f'(Page {page + 1} line {line + 1} invoice total 1234.56) Tj ET\n'
+                       for line in range(lines)).encode('ascii')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(text), text))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        page_ids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % page_id for page_id in page_ids), pages)
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(data)
+    data += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    data += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    data += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+@pytest.mark.parametrize('text_layer', [False, True])
+@pytest.mark.parametrize('pages', [4, 16])
+def test_born_digital_scan(benchmark, stub_eu, tmp_path, pages, text_layer):
+    pdf_fp = make_text_pdf(str(tmp_path / 'digital.pdf'), pages=pages, lines=20)
+    eu = stub_eu(page_cache=False, text_layer=text_layer)
+    benchmark.extra_info['pages'] = pages
+    detections = benchmark.pedantic(eu.scan_detections, args=(pdf_fp,), rounds=3)
+    if text_layer:
+        assert 'invoice' in set(detections.texts)
+
+
+def test_mixed_document(stub_eu, tmp_path, pdf_factory):
+    # a text page is read from its text layer, the scanned page is still OCRed
+    digital_fp = make_text_pdf(str(tmp_path / 'digital.pdf'), pages=1)
+    scanned_fp = pdf_factory(name='scanned.pdf', pages=1)
+    eu = stub_eu(page_cache=False, text_layer=True)
+    assert len(eu.get_text_layer(digital_fp)) == 1
+    assert eu.get_text_layer(scanned_fp) == {}
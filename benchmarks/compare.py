@@ -0,0 +1,48 @@
+"""
+Compare two benchmark result files.
+
+Usage:
+    python -m pytest benchmarks --benchmark-json before.json
+    ... make changes ...
+    python -m pytest benchmarks --benchmark-json after.json
+    python benchmarks/compare.py before.json after.json
+
+Works with files written by pytest-benchmark or by the fallback fixture in conftest.py.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        return {bench['fullname']: bench['stats'] for bench in json.load(f)['benchmarks']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--stat', default='min', choices=['min', 'mean', 'median', 'max'])
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help='Flag benchmarks that got slower by more than this factor.')
+    args = parser.parse_args(argv)
+    before, after = load(args.before), load(args.after)
+    regressions = 0
+    width = max([len(name) for name in before.keys() | after.keys()] + [9])
+    print(f'{"benchmark":<{width}}  {"before":>12}  {"after":>12}  {"ratio":>7}')
+    for name in sorted(before.keys() | after.keys()):
+        old = before.get(name, {}).get(args.stat)
+        new = after.get(name, {}).get(args.stat)
+        if old is None or new is None:
+            print(f'{name:<{width}}  {old if old is not None else "-":>12}  {new if new is not None else "-":>12}')
+            continue
+        ratio = new / old if old else float('inf')
+        flag = '  slower' if ratio > args.threshold else ''
+        regressions += ratio > args.threshold
+        print(f'{name:<{width}}  {old:>12.6f}  {new:>12.6f}  {ratio:>7.2f}{flag}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import pytest
+
+# Import the module the same way it is installed by setup.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'easyocr_unstructured'))
+# and the repository root last, for the reference implementations kept with the tests
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_collect_file(file_path, parent):
+    # Benchmarks live in bench_*.py so a plain pytest run doesn't mistake them for tests.
+    # Files named on the command line are already collected by pytest itself
+    if (file_path.suffix == '.py' and file_path.name.startswith('bench_')
+            and not parent.session.isinitpath(file_path)):
+        return pytest.Module.from_parent(parent, path=file_path)
+
+
+def make_pdf(path, pages=1, lines=20, size=(1275, 1650)):
+    """
+    Write a simple image-only PDF with a few lines of printed text per page.
+
+    Args:
+        path (str): Where to write the PDF.
+        pages (int): The number of pages.
+        lines (int): The number of text lines per page.
+        size (tuple): The page size in pixels.
+
+    Returns:
+        str: The path of the written PDF.
+    """
+    from PIL import Image, ImageDraw
+
+    images = []
+    for page in range(pages):
+        image = Image.new('RGB', size, 'white')
+        draw = ImageDraw.Draw(image)
+        for line in range(lines):
+            draw.text((100, 60 + line * 70), f'Page {page + 1} line {line + 1} invoice total 1234.56',
+                      fill='black')
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:])
+    return path
+
+
+def expected_words(pages, lines):
+    """
+    Return the words make_pdf prints, lowercased, to measure how many of them OCR finds.
+
+    Args:
+        pages (int): The number of pages of the PDF.
+        lines (int): The number of text lines per page.
+
+    Returns:
+        set: The distinct words.
+    """
+    words = set()
+    for page in range(pages):
+        for line in range(lines):
+            words.update(f'Page {page + 1} line {line + 1} invoice total 1234.56'.lower().split())
+    return words
+
+
+@pytest.fixture
+def pdf_factory(tmp_path):
+    def factory(name='doc.pdf', **kwargs):
+        return make_pdf(str(tmp_path / name), **kwargs)
+    return factory
+
+
+@pytest.fixture
+def stub_eu(tmp_path, monkeypatch):
+    """
+    Build EasyocrUnstructured objects that OCR with a StubReader and cache under tmp_path.
+    """
+    from easyocr_unstructured import EasyocrUnstructured
+    from stub_reader import install_stub_reader
+
+    monkeypatch.chdir(tmp_path)
+
+    def factory(reader=None, **kwargs):
+        eu = EasyocrUnstructured(**kwargs)
+        install_stub_reader(EasyocrUnstructured, reader, eu.lang_list, eu.gpu)
+        return eu
+    yield factory
+    EasyocrUnstructured.release_readers()
+
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    # Results are written in the same JSON layout as pytest-benchmark's --benchmark-json so
+    # compare.py can diff runs made with or without the plugin
+    _results = []
+
+    def pytest_addoption(parser):
+        parser.addoption('--benchmark-json', default=None, metavar='PATH',
+                         help='Save the benchmark results to PATH as JSON.')
+
+    def pytest_sessionfinish(session):
+        path = session.config.getoption('--benchmark-json')
+        if path and _results:
+            with open(path, 'w') as f:
+                json.dump({'machine_info': {'python_version': platform.python_version(),
+                                            'machine': platform.machine(), 'cpu_count': os.cpu_count()},
+                           'datetime': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                           'benchmarks': _results}, f, indent=2)
+
+    class _Benchmark:
+        """Minimal stand in for the pytest-benchmark fixture when the plugin isn't installed."""
+        def __init__(self, name, fullname):
+            self.name = name
+            self.fullname = fullname
+            self.extra_info = {}
+            self.timings = []
+
+        def pedantic(self, target, args=(), kwargs=None, setup=None, rounds=1, iterations=1):
+            kwargs = kwargs or {}
+            result = None
+            for _ in range(rounds):
+                if setup is not None:
+                    setup()
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    result = target(*args, **kwargs)
+                self.timings.append((time.perf_counter() - start) / iterations)
+            return result
+
+        def __call__(self, target, *args, **kwargs):
+            return self.pedantic(target, args=args, kwargs=kwargs, rounds=5)
+
+        def stats(self):
+            return {'min': min(self.timings), 'max': max(self.timings),
+                    'mean': statistics.mean(self.timings), 'median': statistics.median(self.timings),
+                    'stddev': statistics.stdev(self.timings) if len(self.timings) > 1 else 0.0,
+                    'rounds': len(self.timings)}
+
+    @pytest.fixture
+    def benchmark(request):
+        bench = _Benchmark(request.node.name, request.node.nodeid)
+        yield bench
+        if bench.timings:
+            stats = bench.stats()
+            _results.append({'name': bench.name, 'fullname': bench.fullname, 'stats': stats,
+                             'extra_info': bench.extra_info})
+            print(f'\n{bench.name}: min {stats["min"]:.6f}s mean {stats["mean"]:.6f}s {bench.extra_info}')
@@ -0,0 +1,141 @@
+"""Synthetic OCR entries for exercising the grouping code without running OCR."""
+import random
+
+
+def make_box(left, top, width, height):
+    return [[left, top], [left + width, top], [left + width, top + height], [left, top + height]]
+
+
+def scattered_labels(count, seed=0, page_size=(1700, 2200)):
+    """
+    Short labels at random positions, like a form or a diagram.
+
+    Args:
+        count (int): The number of entries.
+        seed (int): The random seed.
+        page_size (tuple): The page width and height in pixels.
+
+    Returns:
+        list: Entries in the [p1, p2, p3, p4, text] shape produced by scan_pdf.
+    """
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        width, height = rng.randint(20, 200), rng.randint(12, 30)
+        box = make_box(rng.randint(0, page_size[0] - width), rng.randint(0, page_size[1] - height),
+                       width, height)
+        entries.append(box + [f'label{i % 50}'])
+    return entries
+
+
+def text_lines(count, seed=0, words_per_line=8, jitter=3, page_height=2200):
+    """
+    Rows of words with a little vertical jitter, like a printed page, continued onto as many
+    pages as needed. Pages are stacked vertically.
+
+    Args:
+        count (int): The number of entries.
+        seed (int): The random seed.
+        words_per_line (int): The number of words on each line.
+        jitter (int): The maximum vertical offset of a word from its line in pixels.
+        page_height (int): The height of a page in pixels.
+
+    Returns:
+        list: Entries in the [p1, p2, p3, p4, text] shape produced by scan_pdf.
+    """
+    rng = random.Random(seed)
+    entries = []
+    lines_per_page = page_height // 40
+    for i in range(count):
+        line, word = divmod(i, words_per_line)
+        page, line_on_page = divmod(line, lines_per_page)
+        top = page * page_height + 60 + line_on_page * 40 + rng.randint(0, jitter)
+        left = 100 + word * 180 + rng.randint(0, 40)
+        entries.append(make_box(left, top, rng.randint(60, 150), 24) + [f'w{rng.randint(0, 500)}'])
+    return entries
+
+
+def multi_column(count, seed=0, columns=3, gutter=60, page_width=1700, page_height=2200):
+    """
+    Newspaper style columns of short lines, continued onto as many pages as needed.
+
+    Args:
+        count (int): The number of entries.
+        seed (int): The random seed.
+        columns (int): The number of columns on a page.
+        gutter (int): The space between columns in pixels.
+        page_width (int): The width of a page in pixels.
+        page_height (int): The height of a page in pixels.
+
+    Returns:
+        list: Entries in the [p1, p2, p3, p4, text] shape produced by scan_pdf.
+    """
+    rng = random.Random(seed)
+    column_width = (page_width - gutter * (columns + 1)) // columns
+    lines_per_column = (page_height - 120) // 34
+    entries = []
+    for i in range(count):
+        line, _ = divmod(i, 2)
+        column_line, line_in_column = divmod(line, lines_per_column)
+        page, column = divmod(column_line, columns)
+        left = gutter + column * (column_width + gutter) + (i % 2) * column_width // 2
+        top = page * page_height + 60 + line_in_column * 34
+        entries.append(make_box(left, top, rng.randint(column_width // 4, column_width // 2 - 10), 22)
+                       + [f'c{rng.randint(0, 500)}'])
+    return entries
+
+
+def table(count, seed=0, columns=6, cell_width=250, row_height=48, page_height=2200):
+    """
+    A grid of table cells with a value in every cell, continued onto as many pages as needed.
+
+    Args:
+        count (int): The number of entries.
+        seed (int): The random seed.
+        columns (int): The number of table columns.
+        cell_width (int): The width of a cell in pixels.
+        row_height (int): The height of a row in pixels.
+        page_height (int): The height of a page in pixels.
+
+    Returns:
+        list: Entries in the [p1, p2, p3, p4, text] shape produced by scan_pdf.
+    """
+    rng = random.Random(seed)
+    rows_per_page = (page_height - 120) // row_height
+    entries = []
+    for i in range(count):
+        row, column = divmod(i, columns)
+        page, row_on_page = divmod(row, rows_per_page)
+        left = 80 + column * cell_width + rng.randint(0, 10)
+        top = page * page_height + 60 + row_on_page * row_height
+        entries.append(make_box(left, top, rng.randint(40, cell_width - 40), 26)
+                       + [f'{rng.randint(0, 99999) / 100:.2f}'])
+    return entries
+
+
+def dense(count, seed=0, page_size=(1700, 2200)):
+    """
+    Tiny detections packed tightly over the page, like small print or a parts diagram.
+
+    Args:
+        count (int): The number of entries.
+        seed (int): The random seed.
+        page_size (tuple): The page width and height in pixels.
+
+    Returns:
+        list: Entries in the [p1, p2, p3, p4, text] shape produced by scan_pdf.
+    """
+    rng = random.Random(seed)
+    per_row = page_size[0] // 14
+    rows_per_page = page_size[1] // 12
+    entries = []
+    for i in range(count):
+        row, column = divmod(i, per_row)
+        page, row_on_page = divmod(row, rows_per_page)
+        top = page * page_size[1] + row_on_page * 12 + rng.randint(0, 2)
+        entries.append(make_box(column * 14, top, 10, 8) + [chr(65 + rng.randint(0, 25))])
+    return entries
+
+
+LAYOUTS = {'scattered': scattered_labels, 'lines': text_lines, 'columns': multi_column,
+           'table': table, 'dense': dense}
@@ -0,0 +1,57 @@
+"""An easyocr.Reader stand in so benchmarks can run the pipeline without model weights."""
+import time
+
+
+class StubReader:
+    """
+    Return a fixed grid of detections for every image instead of running the OCR models.
+
+    The detections are derived from the image size so the output is deterministic and looks
+    like a page of short left aligned lines. delay seconds are slept per image to stand in
+    for the time the models take.
+    """
+    def __init__(self, lines=40, words_per_line=4, delay=0.0):
+        self.lines = lines
+        self.words_per_line = words_per_line
+        self.delay = delay
+        self.calls = 0
+        self.batched_calls = 0
+
+    def readtext(self, image, **kwargs):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        height, width = image.shape[:2]
+        line_height = max(height // (self.lines + 1), 1)
+        word_width = max(width // (self.words_per_line * 2), 1)
+        detections = []
+        for line in range(self.lines):
+            top = line * line_height
+            for word in range(self.words_per_line):
+                left = word * word_width * 2
+                bbox = [[left, top], [left + word_width, top],
+                        [left + word_width, top + line_height // 2], [left, top + line_height // 2]]
+                detections.append((bbox, f'word{line}_{word}', 0.99))
+        return detections
+
+    def readtext_batched(self, images, **kwargs):
+        self.batched_calls += 1
+        return [self.readtext(image, **kwargs) for image in images]
+
+
+def install_stub_reader(cls, reader=None, lang_list=('en',), gpu=True):
+    """
+    Put a stub reader in the EasyocrUnstructured reader pool.
+
+    Args:
+        cls (type): The EasyocrUnstructured class.
+        reader (StubReader, optional): The reader to install. Defaults to a new StubReader.
+        lang_list (tuple): The languages the reader is registered under.
+        gpu (bool or str): The device the reader is registered under.
+
+    Returns:
+        StubReader: The installed reader.
+    """
+    reader = reader or StubReader()
+    cls._readers[cls.get_reader_key(lang_list, gpu)] = reader
+    return reader
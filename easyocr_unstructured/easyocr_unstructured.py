@@ -3,29 +3,961 @@
 #Wed Dec  4 01:42:15 PM +07 2024
 #easyocr_unstructured.py
 
+# easyocr (which pulls in torch), pdf2image and torch are imported where they are first
+# used, so importing this module, reading cached results and grouping stay fast and light
 import numpy as np
 import time
-import easyocr
-import pdf2image
 import hashlib
+import html
+import argparse
+import asyncio
+import contextlib
 import json
+import logging
+import mmap
 import os
+import queue
+import re
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import weakref
+import multiprocessing
+import filelock
+import glob
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import repeat
+
+logger = logging.getLogger(__name__)
+
+# A page, or a word and its bounding box in points, in the output of pdftotext -bbox
+_TEXT_LAYER_PATTERN = re.compile(r'<page\b(?:[^>]*\bheight="(?P<height>[^"]*)")?'
+                                 r'|<word xMin="([^"]*)" yMin="([^"]*)" xMax="([^"]*)" yMax="([^"]*)">'
+                                 r'(?P<word>[^<]*)</word>')
+
+
+class Metrics:
+    """
+    Per-stage timers and counters for the work done by EasyocrUnstructured.
+    
+    Totals are kept since the object was created, or last reset, while enabled. A call
+    started with begin_call also collects its own figures, whether or not the object is
+    enabled, and hands them to the sink when it ends. A disabled object with no call in
+    progress does nothing but return a shared no-op context manager from stage.
+    
+    Stages timed: hash, cache_lookup, text_layer, rasterize, readtext, detections, grouping,
+    cache_write.
+    Counters: pages, detections, bytes_hashed, cache_hits, cache_misses, page_cache_hits,
+    page_cache_misses, pages_rerendered, text_layer_pages, memory_cache_hits, group_cache_hits.
+    """
+    def __init__(self, enabled=True, sink=None):
+        self.enabled = enabled
+        # called with the report of every call, for example log_report
+        self.sink = sink
+        self.timings = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def stage(self, name):
+        """
+        Return a context manager that times a stage.
+    
+        Args:
+            name (str): The name of the stage.
+    
+        Returns:
+            contextlib.AbstractContextManager: The timer.
+        """
+        if not self.enabled and getattr(self._local, 'call', None) is None:
+            return _NO_STAGE
+        return _StageTimer(self, name)
+    
+    def add_time(self, name, seconds):
+        """
+        Add the time spent in one run of a stage.
+    
+        Args:
+            name (str): The name of the stage.
+            seconds (float): The time spent.
+    
+        Returns:
+            None
+        """
+        if self.enabled:
+            with self._lock:
+                timing = self.timings.setdefault(name, [0, 0.0])
+                timing[0] += 1
+                timing[1] += seconds
+        call = getattr(self._local, 'call', None)
+        if call is not None:
+            call.add_time(name, seconds)
+    
+    def count(self, name, value=1):
+        """
+        Increase a counter.
+    
+        Args:
+            name (str): The name of the counter.
+            value (int, optional): The amount to add. Defaults to 1.
+    
+        Returns:
+            None
+        """
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+        call = getattr(self._local, 'call', None)
+        if call is not None:
+            call.count(name, value)
+    
+    def begin_call(self):
+        """
+        Start collecting the figures of one call made on this thread.
+    
+        Returns:
+            Metrics: The metrics of the call.
+        """
+        call = self._local.call = Metrics()
+        return call
+    
+    def get_call(self):
+        """
+        Return the call being collected on this thread.
+    
+        Returns:
+            Metrics: The metrics of the call, or None if no call is in progress.
+        """
+        return getattr(self._local, 'call', None)
+    
+    def join_call(self, call):
+        """
+        Collect the figures of this thread into a call begun on another thread, for work a
+        call hands off to a helper thread.
+    
+        Args:
+            call (Metrics): The metrics returned by begin_call or get_call, or None.
+    
+        Returns:
+            None
+        """
+        self._local.call = call
+    
+    def end_call(self, call):
+        """
+        Stop collecting the figures of a call and pass its report to the sink.
+    
+        Args:
+            call (Metrics): The metrics returned by begin_call.
+    
+        Returns:
+            dict: The report of the call.
+        """
+        self._local.call = None
+        report = call.report()
+        if self.sink is not None:
+            self.sink(report)
+        return report
+    
+    def report(self):
+        """
+        Return the timings and counters collected so far.
+    
+        Returns:
+            dict: 'timings' maps each stage to its run count and total seconds, 'counters'
+                  maps each counter to its value.
+        """
+        with self._lock:
+            return {'timings': {name: {'count': count, 'seconds': seconds}
+                                for name, (count, seconds) in self.timings.items()},
+                    'counters': dict(self.counters)}
+    
+    def reset(self):
+        """
+        Clear the timings and counters.
+    
+        Returns:
+            None
+        """
+        with self._lock:
+            self.timings.clear()
+            self.counters.clear()
+    
+    def render_prometheus(self, prefix='easyocr_unstructured'):
+        """
+        Render the timings and counters in the Prometheus text exposition format.
+    
+        Args:
+            prefix (str, optional): The prefix of every metric name.
+    
+        Returns:
+            str: The metrics, ready to be served from a /metrics endpoint.
+        """
+        report = self.report()
+        lines = [f'# TYPE {prefix}_stage_seconds_total counter']
+        lines += [f'{prefix}_stage_seconds_total{{stage="{name}"}} {timing["seconds"]}'
+                  for name, timing in sorted(report['timings'].items())]
+        lines.append(f'# TYPE {prefix}_stage_runs_total counter')
+        lines += [f'{prefix}_stage_runs_total{{stage="{name}"}} {timing["count"]}'
+                  for name, timing in sorted(report['timings'].items())]
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class _StageTimer:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.metrics.add_time(self.name, time.perf_counter() - self.start)
+
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+def log_report(report):
+    """
+    Metrics sink that logs the report of each call.
+    
+    Args:
+        report (dict): The report from Metrics.end_call.
+    
+    Returns:
+        None
+    """
+    stages = ', '.join(f'{name} {timing["seconds"]:.3f}s' for name, timing in report['timings'].items())
+    counters = ', '.join(f'{name} {value}' for name, value in report['counters'].items())
+    logger.info('invoke: %s; %s', stages, counters)
+
+
+class InvokeResult(list):
+    """The list of grouped texts returned by invoke, with the report of the call in report."""
+    report = None
+
+
+class Detections:
+    """
+    Columnar OCR detections.
+    
+    Holds the detections of one or more pages as three parallel arrays instead of one Python
+    list per box:
+    
+    - coords: an (N, 4, 2) int32 array of bounding box corner points
+    - texts: an object array of the N recognised strings
+    - confidences: a float32 array of the N recognition confidences, NaN where unknown
+    
+    Row i of the arrays is the entry [p1, p2, p3, p4, text] that get_new_entry produces.
+    page_offsets, when known, is an int64 array of P + 1 offsets where the detections of each
+    of the P pages start and end.
+    """
+    def __init__(self, coords=None, texts=None, confidences=None):
+        self.coords = np.asarray(coords if coords is not None else [], dtype=np.int32).reshape(-1, 4, 2)
+        self.texts = np.empty(len(self.coords), dtype=object)
+        if texts is not None:
+            self.texts[:] = list(texts)
+        if confidences is None:
+            self.confidences = np.full(len(self.coords), np.nan, dtype=np.float32)
+        else:
+            self.confidences = np.asarray(confidences, dtype=np.float32)
+        self.page_offsets = None
+    
+    def __len__(self):
+        return len(self.coords)
+    
+    @classmethod
+    def from_readtext(cls, detections):
+        """
+        Build detections from the output of easyocr.Reader.readtext in one vectorized step.
+    
+        The corner points are truncated to ints the same way get_new_entry does.
+    
+        Args:
+            detections (list): A list of (bbox, text, confidence) tuples.
+    
+        Returns:
+            Detections: The detections.
+        """
+        if len(detections) == 0:
+            return cls()
+        bboxes, texts, confidences = zip(*detections)
+        coords = np.array(bboxes, dtype=np.float64).astype(np.int32)
+        return cls(coords, texts, confidences)
+    
+    @classmethod
+    def from_entries(cls, entries):
+        """
+        Build detections from entries in the [p1, p2, p3, p4, text] format, such as the
+        contents of a JSON cache file. Confidences are not stored in entries and are set to NaN.
+    
+        Args:
+            entries (list): A list of entries.
+    
+        Returns:
+            Detections: The detections.
+        """
+        return cls([entry[:4] for entry in entries], [entry[4] for entry in entries])
+    
+    @classmethod
+    def concatenate(cls, parts):
+        """
+        Join the detections of several pages into one object, keeping their order.
+    
+        Args:
+            parts (list): A list of Detections, one per page.
+    
+        Returns:
+            Detections: The combined detections, with page_offsets marking where each part
+                        starts.
+        """
+        parts = list(parts)
+        if len(parts) == 0:
+            return cls()
+        detections = cls()
+        detections.coords = np.concatenate([part.coords for part in parts])
+        detections.texts = np.concatenate([part.texts for part in parts])
+        detections.confidences = np.concatenate([part.confidences for part in parts])
+        detections.page_offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum([len(part) for part in parts], out=detections.page_offsets[1:])
+        return detections
+    
+    def split_pages(self):
+        """
+        Split the detections back into one object per page.
+    
+        Returns:
+            list: A Detections object per page, views of these arrays, or None if the page
+                  boundaries aren't known.
+        """
+        if self.page_offsets is None:
+            return None
+        pages = []
+        for start, stop in zip(self.page_offsets[:-1].tolist(), self.page_offsets[1:].tolist()):
+            page = Detections()
+            page.coords = self.coords[start:stop]
+            page.texts = self.texts[start:stop]
+            page.confidences = self.confidences[start:stop]
+            pages.append(page)
+        return pages
+    
+    def scaled(self, factor):
+        """
+        Return a copy of the detections with the coordinates multiplied by factor.
+    
+        Args:
+            factor (float): The scale factor, for example the ratio between two render DPIs.
+    
+        Returns:
+            Detections: The scaled detections.
+        """
+        detections = Detections()
+        detections.coords = np.rint(self.coords * factor).astype(np.int32)
+        detections.texts = self.texts
+        detections.confidences = self.confidences
+        detections.page_offsets = self.page_offsets
+        return detections
+    
+    def shifted(self, dx, dy):
+        """
+        Return a copy of the detections with the coordinates moved by (dx, dy), for example
+        from a cropped region back to the page it was cut from.
+    
+        Args:
+            dx (int): The horizontal offset in pixels.
+            dy (int): The vertical offset in pixels.
+    
+        Returns:
+            Detections: The moved detections.
+        """
+        detections = Detections()
+        detections.coords = self.coords + np.array([dx, dy], dtype=np.int32)
+        detections.texts = self.texts
+        detections.confidences = self.confidences
+        return detections
+    
+    def within(self, boxes):
+        """
+        Return the detections whose box centre lies inside any of the given boxes.
+    
+        Args:
+            boxes (list): (x0, y0, x1, y1) boxes in the same coordinate space.
+    
+        Returns:
+            Detections: The matching detections, in their original order.
+        """
+        centres = self.coords.mean(axis=1)
+        mask = np.zeros(len(self), dtype=bool)
+        for x0, y0, x1, y1 in boxes:
+            mask |= ((centres[:, 0] >= x0) & (centres[:, 0] <= x1) &
+                     (centres[:, 1] >= y0) & (centres[:, 1] <= y1))
+        detections = Detections()
+        detections.coords = self.coords[mask]
+        detections.texts = self.texts[mask]
+        detections.confidences = self.confidences[mask]
+        return detections
+    
+    def to_entries(self):
+        """
+        Convert the detections to entries in the [p1, p2, p3, p4, text] format.
+    
+        Returns:
+            list: A list of entries, the same as scan_pdf has always returned.
+        """
+        entries = self.coords.tolist()
+        for entry, text in zip(entries, self.texts.tolist()):
+            entry.append(text)
+        return entries
+
+
+class MemoryCache:
+    """
+    Thread-safe in-process LRU cache with a limit on the approximate memory its values use.
+    
+    Values are sized once, when they are added, with get_size. A value larger than the whole
+    limit isn't cached at all.
+    """
+    def __init__(self, max_bytes):
+        # evict least recently used values once the cache holds more than this many bytes
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @staticmethod
+    def get_size(value):
+        """
+        Estimate the memory used by a cached value.
+    
+        Args:
+            value (Detections or list): Detections, or text groups as returned by group_texts.
+    
+        Returns:
+            int: The approximate size in bytes.
+        """
+        if isinstance(value, Detections):
+            return (value.coords.nbytes + value.confidences.nbytes + value.texts.nbytes
+                    + sum(sys.getsizeof(text) for text in value.texts.tolist()))
+        return sys.getsizeof(value) + sum(sys.getsizeof(group) + sum(sys.getsizeof(text) for text in group)
+                                          for group in value)
+    
+    def get(self, key):
+        """
+        Return a cached value and mark it as the most recently used.
+    
+        Args:
+            key (hashable): The key of the value.
+    
+        Returns:
+            object: The value, or None if it isn't cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def put(self, key, value):
+        """
+        Cache a value, evicting the least recently used values to stay within max_bytes.
+    
+        Args:
+            key (hashable): The key of the value.
+            value (Detections or list): The value to cache.
+    
+        Returns:
+            None
+        """
+        size = self.get_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+    
+    def clear(self):
+        """
+        Remove every value from the cache.
+    
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+class CacheIndex:
+    """
+    Persistent index of the files in the OCR cache directory.
+    
+    The size, last access time and hit count of every cache file are kept in an SQLite
+    database inside the cache directory, so the cache can be kept within a byte budget
+    without listing the directory. Eviction runs a bounded batch at a time after each cache
+    write, or periodically on a background thread, never when the index is created.
+    
+    Files that were already in the directory when the index was first created are added to
+    it the first time it is used. The digests of hashed PDFs are kept in the same database,
+    up to max_file_digests of them and for no longer than max_age_days.
+    """
+    POLICIES = ('lru', 'lfu')
+    INDEX_FILENAME = 'index.sqlite'
+
+    def __init__(self, directory, max_bytes=None, max_age_days=None, policy='lru', eviction_batch=100,
+                 max_file_digests=10000):
+        if policy not in self.POLICIES:
+            raise ValueError(f'policy must be one of {self.POLICIES}, not {policy!r}')
+        self.directory = directory
+        # evict files once the cache holds more than this many bytes, None for no limit
+        self.max_bytes = max_bytes
+        # evict files that haven't been read or written for this many days, None to keep them
+        self.max_age_days = max_age_days
+        # 'lru' evicts the least recently used files first, 'lfu' the least often used
+        self.policy = policy
+        # most files removed by the eviction that follows a cache write
+        self.eviction_batch = eviction_batch
+        # most file digests remembered for trust_file_stat, the most recently hashed are kept
+        self.max_file_digests = max_file_digests
+        self.db_path = os.path.join(directory, self.INDEX_FILENAME)
+        self._connection = None
+        self._lock = threading.RLock()
+        self._eviction_thread = None
+        self._stop_eviction = threading.Event()
+    
+    def get_connection(self):
+        """
+        Return the connection to the index database, opening and creating it if needed.
+    
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=60, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            new_index = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='entries'").fetchone() is None
+            connection.execute('CREATE TABLE IF NOT EXISTS entries (path TEXT PRIMARY KEY, size INTEGER NOT NULL, '
+                               'last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)')
+            connection.execute('CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)')
+            connection.execute('CREATE INDEX IF NOT EXISTS entries_hits ON entries (hits, last_access)')
+            connection.execute('CREATE TABLE IF NOT EXISTS file_digests (path TEXT NOT NULL, algorithm TEXT NOT NULL, '
+                               'signature TEXT NOT NULL, digest TEXT NOT NULL, hashed_at REAL NOT NULL DEFAULT 0, '
+                               'PRIMARY KEY (path, algorithm))')
+            # digests recorded before they were timestamped count as the oldest
+            if 'hashed_at' not in [row[1] for row in connection.execute('PRAGMA table_info(file_digests)')]:
+                connection.execute('ALTER TABLE file_digests ADD COLUMN hashed_at REAL NOT NULL DEFAULT 0')
+            connection.execute('CREATE INDEX IF NOT EXISTS file_digests_hashed_at ON file_digests (hashed_at)')
+            # the total size of the entries is kept up to date by triggers, inside the statements
+            # that change it, so checking the byte budget after a write doesn't scan the table.
+            # An index created before the total existed is summed once, in the same transaction
+            # the triggers are added in so no write from another process is missed
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.execute('CREATE TABLE IF NOT EXISTS stats (id INTEGER PRIMARY KEY CHECK (id = 0), '
+                                   'total_size INTEGER NOT NULL)')
+                connection.execute('CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN '
+                                   'UPDATE stats SET total_size = total_size + new.size WHERE id = 0; END')
+                connection.execute('CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN '
+                                   'UPDATE stats SET total_size = total_size - old.size WHERE id = 0; END')
+                connection.execute('CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN '
+                                   'UPDATE stats SET total_size = total_size + new.size - old.size WHERE id = 0; END')
+                connection.execute('INSERT OR IGNORE INTO stats (id, total_size) '
+                                   'SELECT 0, COALESCE(SUM(size), 0) FROM entries')
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            self._connection = connection
+            if new_index:
+                self.rebuild()
+        return self._connection
+    
+    def get_key(self, path):
+        """
+        Return the key a cache file is stored under in the index, its path relative to the
+        cache directory.
+    
+        Args:
+            path (str): The path of the cache file.
+    
+        Returns:
+            str: The key.
+        """
+        return os.path.relpath(path, self.directory)
+    
+    def record_write(self, path):
+        """
+        Add a newly written cache file to the index, then evict other files if the cache is
+        over its limits.
+    
+        New files start with one hit, the write, so under the 'lfu' policy they aren't
+        always the first to go once every older file has been read.
+    
+        Args:
+            path (str): The path of the cache file.
+    
+        Returns:
+            None
+        """
+        size = os.path.getsize(path)
+        key = self.get_key(path)
+        with self._lock:
+            self.get_connection().execute(
+                'INSERT INTO entries (path, size, last_access, hits) VALUES (?, ?, ?, 1) '
+                'ON CONFLICT(path) DO UPDATE SET size = excluded.size, last_access = excluded.last_access',
+                (key, size, time.time()))
+        if self.max_bytes is not None or self.max_age_days is not None:
+            self.evict(self.eviction_batch, keep=key)
+    
+    def record_access(self, path):
+        """
+        Mark a cache file as used.
+    
+        Args:
+            path (str): The path of the cache file.
+    
+        Returns:
+            None
+        """
+        with self._lock:
+            self.get_connection().execute('UPDATE entries SET last_access = ?, hits = hits + 1 WHERE path = ?',
+                                          (time.time(), self.get_key(path)))
+    
+    def remove(self, path):
+        """
+        Remove a cache file from the index. The file itself is left alone.
+    
+        Args:
+            path (str): The path of the cache file.
+    
+        Returns:
+            None
+        """
+        with self._lock:
+            self.get_connection().execute('DELETE FROM entries WHERE path = ?', (self.get_key(path),))
+    
+    def total_size(self):
+        """
+        Return the total size of the indexed cache files.
+    
+        Returns:
+            int: The size in bytes.
+        """
+        with self._lock:
+            return self.get_connection().execute('SELECT total_size FROM stats WHERE id = 0').fetchone()[0]
+    
+    def evict(self, limit=None, keep=None):
+        """
+        Delete cache files that are too old, then the least recently or least often used
+        files until the cache is within max_bytes.
+    
+        Args:
+            limit (int, optional): The most files to delete. Defaults to no limit.
+            keep (str, optional): The index key of a file that mustn't be deleted, such as
+                the one that was just written.
+    
+        Returns:
+            int: The number of files deleted.
+        """
+        order = 'last_access' if self.policy == 'lru' else 'hits, last_access'
+        with self._lock:
+            connection = self.get_connection()
+            victims = []
+            if self.max_age_days is not None:
+                threshold = time.time() - self.max_age_days * 86400
+                victims = connection.execute('SELECT path, size FROM entries WHERE last_access < ? '
+                                             'ORDER BY last_access LIMIT ?',
+                                             (threshold, -1 if limit is None else limit)).fetchall()
+            if self.max_bytes is not None and (limit is None or len(victims) < limit):
+                excess = connection.execute('SELECT total_size FROM stats WHERE id = 0').fetchone()[0] - self.max_bytes
+                excess -= sum(size for _, size in victims)
+                if excess > 0:
+                    aged = {path for path, _ in victims}
+                    for path, size in connection.execute(f'SELECT path, size FROM entries ORDER BY {order}'):
+                        if excess <= 0 or (limit is not None and len(victims) >= limit):
+                            break
+                        if path not in aged and path != keep:
+                            victims.append((path, size))
+                            excess -= size
+            for path, _ in victims:
+                try:
+                    os.remove(os.path.join(self.directory, path))
+                except FileNotFoundError:
+                    pass
+            connection.executemany('DELETE FROM entries WHERE path = ?', [(path,) for path, _ in victims])
+            self.prune_file_digests()
+        return len(victims)
+    
+    def get_file_digest(self, path, algorithm, signature):
+        """
+        Look up the digest recorded for a file, if the file hasn't changed since.
+    
+        Args:
+            path (str): The absolute path of the file.
+            algorithm (str): The name of the hash algorithm.
+            signature (str): The file's current size, modification time and inode.
+    
+        Returns:
+            str: The recorded digest, or None if there is none or the file has changed.
+        """
+        with self._lock:
+            row = self.get_connection().execute(
+                'SELECT signature, digest FROM file_digests WHERE path = ? AND algorithm = ?',
+                (path, algorithm)).fetchone()
+        if row is None or row[0] != signature:
+            return None
+        return row[1]
+    
+    def set_file_digest(self, path, algorithm, signature, digest):
+        """
+        Record the digest of a file along with the signature it had when it was hashed.
+    
+        Args:
+            path (str): The absolute path of the file.
+            algorithm (str): The name of the hash algorithm.
+            signature (str): The file's size, modification time and inode.
+            digest (str): The hexadecimal digest.
+    
+        Returns:
+            None
+        """
+        with self._lock:
+            self.get_connection().execute(
+                'INSERT OR REPLACE INTO file_digests (path, algorithm, signature, digest, hashed_at) '
+                'VALUES (?, ?, ?, ?, ?)', (path, algorithm, signature, digest, time.time()))
+            self.prune_file_digests()
+    
+    def prune_file_digests(self):
+        """
+        Forget the digests of files hashed more than max_age_days ago, then the least
+        recently hashed files beyond max_file_digests. A forgotten file is hashed again the
+        next time it is used.
+    
+        Returns:
+            int: The number of digests removed.
+        """
+        removed = 0
+        with self._lock:
+            connection = self.get_connection()
+            if self.max_age_days is not None:
+                threshold = time.time() - self.max_age_days * 86400
+                removed += connection.execute('DELETE FROM file_digests WHERE hashed_at < ?', (threshold,)).rowcount
+            if self.max_file_digests is not None:
+                removed += connection.execute(
+                    'DELETE FROM file_digests WHERE rowid IN (SELECT rowid FROM file_digests '
+                    'ORDER BY hashed_at DESC LIMIT -1 OFFSET ?)', (self.max_file_digests,)).rowcount
+        return removed
+    
+    def rebuild(self):
+        """
+        Add every cache file in the directory that isn't in the index yet, using its
+        modification time as its last access time. This walks the whole directory.
+    
+        Returns:
+            int: The number of files added.
+        """
+        rows = []
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                # skip the index itself and the lock and temporary files that sit next to cache files
+                if filename.startswith(self.INDEX_FILENAME) or filename.endswith(('.lock', '.tmp')):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                rows.append((self.get_key(path), stat.st_size, stat.st_mtime))
+        with self._lock:
+            self.get_connection().executemany(
+                'INSERT OR IGNORE INTO entries (path, size, last_access) VALUES (?, ?, ?)', rows)
+        return len(rows)
+    
+    def start_background_eviction(self, interval=60):
+        """
+        Run evict every interval seconds on a daemon thread.
+    
+        Args:
+            interval (float): The number of seconds between evictions.
+    
+        Returns:
+            None
+        """
+        if self._eviction_thread is not None:
+            return
+        self._stop_eviction.clear()
+
+        def run():
+            while not self._stop_eviction.wait(interval):
+                self.evict()
+        self._eviction_thread = threading.Thread(target=run, name='easyocr-unstructured-eviction', daemon=True)
+        self._eviction_thread.start()
+    
+    def stop_background_eviction(self):
+        """
+        Stop the background eviction thread, if it is running.
+    
+        Returns:
+            None
+        """
+        if self._eviction_thread is not None:
+            self._stop_eviction.set()
+            self._eviction_thread.join()
+            self._eviction_thread = None
 
 
 class EasyocrUnstructured:
-    def __init__(self):        
-        # directory where files are saved to prevent hte slow process of scanning hte pdfs if possible
-        self.output_dir = os.path.join('tmp', 'easyocr_unstructured')
-        
-        if not os.path.exists(self.output_dir):
-            new_dir = '.'
-            for entry in os.path.split(self.output_dir):                
-                new_dir = os.path.join(new_dir, entry)
-                if not os.path.exists(new_dir):
-                    os.mkdir(new_dir)
+    # easyocr.Reader instances shared by every EasyocrUnstructured object in the process,
+    # keyed by (languages, device). Loading the detection and recognition models is the most
+    # expensive step of a scan so each combination is only loaded once
+    _readers = {}
+    _readers_lock = threading.Lock()
+    # a reader isn't safe to call from several threads at once, so each reader key has a lock
+    # held around its readtext calls
+    _reader_locks = {}
+    # Binary OCR cache layout, see write_cache. Bump the version when the layout changes so
+    # old files are rescanned instead of misread
+    CACHE_MAGIC = 0x31545545  # b'EUT1'
+    CACHE_VERSION = 2
+    CACHE_EXTENSION = '.npy'
+    LEGACY_CACHE_EXTENSION = '.txt'
+    # Inference settings selected with inference_profile. quantize is passed to easyocr.Reader,
+    # which applies dynamic int8 quantization to the models when they run on the CPU, as it
+    # does by default. threads and interop_threads set torch's intra- and inter-op thread
+    # counts for the whole process, None leaves them alone. inference_mode runs the models
+    # under torch.inference_mode, and channels_last converts the convolutional text detector
+    # to the channels last memory format
+    INFERENCE_PROFILES = {
+        'default': {'quantize': True, 'threads': None, 'interop_threads': None, 'inference_mode': False,
+                    'channels_last': False},
+        'fp32': {'quantize': False, 'threads': None, 'interop_threads': None, 'inference_mode': False,
+                 'channels_last': False},
+        'cpu': {'quantize': True, 'threads': None, 'interop_threads': 1, 'inference_mode': True,
+                'channels_last': True},
+    }
+
+    def __init__(self, lang_list=None, gpu=True, page_chunk_size=None, workers=1, torch_threads=None,
+                 page_cache=True, cache_max_bytes=None, cache_max_age_days=7, cache_policy='lru',
+                 hasher='sha1', hash_buffer_size=1 << 20, hash_mmap=False, trust_file_stat=True,
+                 max_concurrency=None, metrics=None, dpi=200, grayscale=False, adaptive_dpi=None,
+                 adaptive_min_confidence=0.5, text_layer=False, text_layer_min_words=10,
+                 text_layer_min_coverage=0.05, batch_size=1, page_batch_size=1, batch_max_bytes=256 << 20,
+                 cache_dir=None, memory_cache_bytes=64 << 20, cache_groups=True, prefetch_pages=0,
+                 inference_profile=None):
+        # languages and device used for OCR, passed straight through to easyocr.Reader
+        self.lang_list = list(lang_list) if lang_list else ['en']
+        self.gpu = gpu
+        # number of pages rasterized at a time, None rasterizes the whole document up front.
+        # Setting this keeps memory flat for long documents
+        self.page_chunk_size = page_chunk_size
+        # render up to this many pages ahead on a background thread while the current page is
+        # OCRed, so rasterization and OCR overlap. Without page_chunk_size pages are then
+        # rendered prefetch_pages at a time
+        self.prefetch_pages = prefetch_pages
+        # pages are rasterized at dpi, and the coordinates of every detection are in pixels at
+        # this resolution whatever resolution the page was actually OCRed at, so
+        # proximity_in_pixels always means the same thing
+        self.dpi = dpi
+        # render pages in grayscale, which is cheaper to rasterize and pass to the reader
+        self.grayscale = grayscale
+        # when set, pages are OCRed at this lower dpi first and only rendered and OCRed again at
+        # dpi when the mean confidence of their detections is below adaptive_min_confidence
+        self.adaptive_dpi = adaptive_dpi
+        self.adaptive_min_confidence = adaptive_min_confidence
+        # take the words of born-digital pages from their embedded text layer instead of OCRing
+        # them. Pages with fewer than text_layer_min_words words, or whose words cover less than
+        # text_layer_min_coverage of the page height, are rasterized and OCRed: a scanned page
+        # can carry a few real text objects, such as a stamped page number or a watermark, and
+        # skipping its OCR would lose everything in the image. Sparse born-digital pages are
+        # OCRed too, which costs time but loses nothing
+        self.text_layer = text_layer
+        self.text_layer_min_words = text_layer_min_words
+        self.text_layer_min_coverage = text_layer_min_coverage
+        # batch_size is the number of text crops the recognizer reads at once, passed straight
+        # through to easyocr. Up to page_batch_size pages of the same size are detected in one
+        # readtext_batched call, as long as their pixels take no more than batch_max_bytes
+        self.batch_size = batch_size
+        self.page_batch_size = page_batch_size or 1
+        self.batch_max_bytes = batch_max_bytes
+        # number of processes pages are OCRed in, 1 OCRs every page in this process
+        self.workers = workers
+        # torch intra-op threads per worker process, defaults to an even share of the cores so
+        # the workers don't oversubscribe the machine
+        self.torch_threads = torch_threads
+        # how the models are run, the name of one of INFERENCE_PROFILES or a dict overriding
+        # some of the default profile's settings. The thread counts are applied to the process
+        # the first time this object loads its reader
+        self.inference_profile = self.get_inference_profile(inference_profile)
+        self._threads_applied = False
+        # process pool for parallel scans, started on the first parallel scan and kept for reuse
+        self._executor = None
+        # cache the detections of every page as soon as it is OCRed, so an interrupted scan
+        # resumes where it stopped and unchanged pages of an edited document aren't OCRed again
+        self.page_cache = page_cache
+
+        # directory where files are saved to prevent hte slow process of scanning hte pdfs if possible.
+        # It is made absolute straight away so changing the working directory later, or
+        # sharing it between processes started in different places, can't split the cache.
+        # Cache files are spread over subdirectories named after the first two characters of
+        # their hash, see get_shard_path
+        self.output_dir = os.path.abspath(cache_dir or os.path.join('tmp', 'easyocr_unstructured'))
+        os.makedirs(self.output_dir, exist_ok=True)
+        # page level cache files are kept in their own directory
+        self.page_dir = os.path.join(self.output_dir, 'pages')
+        os.makedirs(self.page_dir, exist_ok=True)
         
-        # Delete parsed PDF json files older than 7 days in output_dir
-        self.delete_old_files(self.output_dir, days=7)        
+        # Cache files are evicted by age and size as new ones are written rather than here, so
+        # creating an object costs the same however large the cache is
+        self.cache_index = CacheIndex(self.output_dir, max_bytes=cache_max_bytes,
+                                      max_age_days=cache_max_age_days, policy=cache_policy)
+        # the detections and grouped results of recently used documents are kept in memory, up to
+        # about memory_cache_bytes, so repeat calls skip the disk cache and grouping. 0 disables it
+        self.memory_cache = MemoryCache(memory_cache_bytes or 0)
+        # save grouped results next to the OCR cache file, one file per proximity
+        self.cache_groups = cache_groups
+        # hash used to identify PDFs, a hashlib algorithm name such as 'sha1' or 'blake2b', or
+        # a callable returning a new hash object. Cached results are only found with the same hash
+        self.hasher = hasher
+        # PDFs are hashed in reads of this many bytes, or through a memory map with hash_mmap
+        self.hash_buffer_size = hash_buffer_size
+        self.hash_mmap = hash_mmap
+        # reuse the digest of a file whose size, modification time and inode are unchanged
+        # instead of reading it again
+        self.trust_file_stat = trust_file_stat
+        # throughput summary of the last invoke_many batch
+        self.batch_summary = None
+        # most documents ainvoke scans at once, defaults to one per worker
+        self.max_concurrency = max_concurrency or max(1, workers)
+        # executors ainvoke runs blocking work on, started on first use
+        self._io_executor = None
+        self._ocr_executor = None
+        # per event loop concurrency limit and in-flight scans of ainvoke
+        self._async_state = weakref.WeakKeyDictionary()
+        # timings and counters, pass True or a Metrics object to collect them
+        if isinstance(metrics, Metrics):
+            self.metrics = metrics
+        else:
+            self.metrics = Metrics(enabled=bool(metrics))
 
     def delete_old_files(self, directory, days):
         """
@@ -61,9 +993,175 @@ class EasyocrUnstructured:
                 # Delete the file if it's older than the threshold
                 if file_mod_time < threshold:
                     os.remove(file_path)
-                    print(f"Deleted old file: {file_path}")  # Optional: log the deletion
+                    logger.info('Deleted old file: %s', file_path)
 
     
+    @classmethod
+    def get_inference_profile(cls, profile=None):
+        """
+        Resolve an inference profile into its settings.
+    
+        Args:
+            profile (str or dict, optional): The name of one of INFERENCE_PROFILES, or a dict
+                of settings applied over the default profile. Defaults to the default profile.
+    
+        Returns:
+            dict: Every setting of the profile.
+    
+        Raises:
+            ValueError: If the profile name or one of the settings is unknown.
+        """
+        if profile is None:
+            profile = 'default'
+        if isinstance(profile, str):
+            if profile not in cls.INFERENCE_PROFILES:
+                raise ValueError(f'Unknown inference profile {profile!r}, '
+                                 f'expected one of {sorted(cls.INFERENCE_PROFILES)}')
+            return dict(cls.INFERENCE_PROFILES[profile])
+        unknown = set(profile) - set(cls.INFERENCE_PROFILES['default'])
+        if unknown:
+            raise ValueError(f'Unknown inference settings {sorted(unknown)}')
+        return dict(cls.INFERENCE_PROFILES['default'], **profile)
+    
+    @staticmethod
+    def get_reader_key(lang_list, gpu, profile=None):
+        """
+        Build the key used to share easyocr.Reader instances between calls.
+    
+        Args:
+            lang_list (list): The languages the reader recognises.
+            gpu (bool or str): The gpu argument passed to easyocr.Reader, either a bool or a
+                device string such as 'cuda:0'.
+            profile (dict, optional): The inference profile the reader's models were loaded
+                with, see get_inference_profile. Defaults to the default profile.
+    
+        Returns:
+            tuple: A tuple of the languages and the device name, followed by the profile
+                   settings that change the models when they aren't the defaults.
+        """
+        if isinstance(gpu, str):
+            device = gpu
+        else:
+            device = 'cuda' if gpu else 'cpu'
+        key = (tuple(lang_list), device)
+        if profile is not None and (not profile['quantize'] or profile['channels_last']):
+            key += (profile['quantize'], profile['channels_last'])
+        return key
+    
+    def get_reader(self):
+        """
+        Return the shared easyocr.Reader for this object's languages and device.
+    
+        The reader is created the first time it is requested and reused by every later call,
+        including calls from other EasyocrUnstructured objects with the same settings. Its
+        models are loaded as the inference profile says.
+    
+        Returns:
+            easyocr.Reader: The loaded reader.
+        """
+        if not self._threads_applied:
+            self.apply_inference_threads()
+        profile = self.inference_profile
+        key = self.get_reader_key(self.lang_list, self.gpu, profile)
+        reader = self._readers.get(key)
+        if reader is None:
+            with self._readers_lock:
+                # another thread may have loaded the reader while we waited for the lock
+                reader = self._readers.get(key)
+                if reader is None:
+                    import easyocr
+                    reader = easyocr.Reader(self.lang_list, gpu=self.gpu, quantize=profile['quantize'])
+                    if profile['channels_last']:
+                        import torch
+                        reader.detector = reader.detector.to(memory_format=torch.channels_last)
+                    EasyocrUnstructured._readers[key] = reader
+        return reader
+    
+    def get_reader_lock(self):
+        """
+        Return the lock held while this object's shared reader runs.
+    
+        Returns:
+            threading.Lock: The lock of the reader's key.
+        """
+        key = self.get_reader_key(self.lang_list, self.gpu, self.inference_profile)
+        lock = self._reader_locks.get(key)
+        if lock is None:
+            with self._readers_lock:
+                lock = EasyocrUnstructured._reader_locks.setdefault(key, threading.Lock())
+        return lock
+    
+    def apply_inference_threads(self):
+        """
+        Set torch's intra- and inter-op thread counts from the inference profile.
+    
+        The counts apply to the whole process. torch only lets the inter-op count be set
+        before its first parallel work, so a later attempt is logged and skipped.
+    
+        Returns:
+            None
+        """
+        self._threads_applied = True
+        threads = self.inference_profile['threads']
+        interop_threads = self.inference_profile['interop_threads']
+        if threads is None and interop_threads is None:
+            return
+        import torch
+        if threads is not None:
+            torch.set_num_threads(threads)
+        if interop_threads is not None and torch.get_num_interop_threads() != interop_threads:
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError as e:
+                logger.warning('Could not set torch inter-op threads to %d: %s', interop_threads, e)
+    
+    def inference_context(self):
+        """
+        Return the context the models are run in.
+    
+        Returns:
+            contextlib.AbstractContextManager: torch.inference_mode() if the inference profile
+                                              enables it, otherwise a context that does nothing.
+        """
+        if not self.inference_profile['inference_mode']:
+            return contextlib.nullcontext()
+        import torch
+        return torch.inference_mode()
+    
+    def warm_up(self):
+        """
+        Load the reader ahead of the first scan so the first invoke call doesn't pay for it.
+    
+        Returns:
+            easyocr.Reader: The loaded reader.
+        """
+        return self.get_reader()
+    
+    @classmethod
+    def release_readers(cls, lang_list=None, gpu=None):
+        """
+        Drop shared readers so the memory held by their models can be reclaimed.
+    
+        Args:
+            lang_list (list, optional): Only release readers for these languages. Defaults to
+                releasing readers for every language list.
+            gpu (bool or str, optional): Only release readers for this device. Defaults to
+                releasing readers for every device.
+    
+        Returns:
+            int: The number of readers released.
+        """
+        with cls._readers_lock:
+            released = 0
+            for key in list(cls._readers):
+                if lang_list is not None and key[0] != tuple(lang_list):
+                    continue
+                if gpu is not None and key[1] != cls.get_reader_key(key[0], gpu)[1]:
+                    continue
+                del cls._readers[key]
+                released += 1
+        return released
+    
     def get_new_entry(self, entry):
         """
         Convert an entry into a new bounding box format.
@@ -83,9 +1181,477 @@ class EasyocrUnstructured:
         bbox.append(text)
         return bbox
     
+    @staticmethod
+    def is_path(pdf_fp):
+        """
+        Tell a PDF file path from a PDF held in memory.
+    
+        Args:
+            pdf_fp (str, os.PathLike, bytes, bytearray or memoryview): The document.
+    
+        Returns:
+            bool: True if pdf_fp is a file path.
+        """
+        return isinstance(pdf_fp, (str, os.PathLike))
+    
+    def read_document(self, pdf_fp):
+        """
+        Return a document in a form every stage of a scan can read more than once.
+    
+        Paths and bytes are returned as they are. A binary file object is read once, from its
+        current position, so it can be hashed and scanned from the same buffer.
+    
+        Args:
+            pdf_fp (str, os.PathLike, bytes, bytearray, memoryview or file object): The
+                document, a file path or the contents of a PDF file.
+    
+        Returns:
+            str, os.PathLike, bytes, bytearray or memoryview: The document.
+        """
+        if hasattr(pdf_fp, 'read'):
+            return pdf_fp.read()
+        return pdf_fp
+    
+    @contextlib.contextmanager
+    def spooled_document(self, pdf_fp):
+        """
+        Give poppler and the worker processes a file path to read a document from.
+    
+        A document held in memory is written to one temporary file for the whole scan, which
+        is deleted afterwards, so every page count, render and worker task reads that file
+        instead of each being handed a copy of the contents.
+    
+        Args:
+            pdf_fp (str, os.PathLike, bytes, bytearray or memoryview): The document.
+    
+        Yields:
+            str or os.PathLike: The path of the document.
+        """
+        if self.is_path(pdf_fp):
+            yield pdf_fp
+            return
+        fd, temp_fp = tempfile.mkstemp(suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf_fp)
+            yield temp_fp
+        finally:
+            os.remove(temp_fp)
+    
+    def get_page_count(self, pdf_path):
+        """
+        Return the number of pages in a PDF file.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+    
+        Returns:
+            int: The number of pages.
+        """
+        import pdf2image
+        return pdf2image.pdfinfo_from_path(pdf_path)['Pages']
+    
+    def render_pages(self, pdf_path, first_page=None, last_page=None, dpi=None):
+        """
+        Rasterize pages of a PDF file.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            first_page (int, optional): The first page to render, starting at 1. Defaults to
+                the first page of the document.
+            last_page (int, optional): The last page to render, inclusive. Defaults to the
+                last page of the document.
+            dpi (int, optional): The resolution to render at. Defaults to the first pass
+                resolution, adaptive_dpi if it is set and dpi otherwise.
+    
+        Returns:
+            list: A list of PIL images, one per rendered page.
+        """
+        import pdf2image
+        with self.metrics.stage('rasterize'):
+            return pdf2image.convert_from_path(pdf_path, dpi=dpi or self.adaptive_dpi or self.dpi,
+                                               first_page=first_page, last_page=last_page,
+                                               grayscale=self.grayscale)
+    
+    def iter_pages(self, pdf_path, page_numbers=None, dpi=None):
+        """
+        Yield the rasterized pages of a PDF file in order.
+    
+        When page_chunk_size is set the pages are rendered page_chunk_size at a time so only
+        one chunk is ever held in memory. Each image is released by the generator as soon as it
+        has been handed out so it can be freed once the caller is done with it.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            page_numbers (list, optional): The pages to render, in ascending order. Defaults to
+                every page.
+            dpi (int, optional): The resolution to render at, see render_pages.
+    
+        Yields:
+            PIL.Image.Image: One image per page.
+        """
+        if page_numbers is not None:
+            chunks = self.iter_page_runs(page_numbers)
+        elif not (self.page_chunk_size or self.prefetch_pages):
+            chunks = [(None, None)]
+        else:
+            chunks = self.iter_page_runs(range(1, self.get_page_count(pdf_path) + 1))
+        for first_page, last_page in chunks:
+            images = self.render_pages(pdf_path, first_page=first_page, last_page=last_page, dpi=dpi)
+            images.reverse()
+            while images:
+                yield images.pop()
+    
+    def iter_page_runs(self, page_numbers):
+        """
+        Split page numbers into runs of consecutive pages that can be rendered in one call.
+    
+        Args:
+            page_numbers (list): Page numbers in ascending order.
+    
+        Returns:
+            list: (first_page, last_page) tuples, no longer than page_chunk_size pages if it
+                  is set, or prefetch_pages pages if that is.
+        """
+        chunk_size = self.page_chunk_size or self.prefetch_pages
+        runs = []
+        for page_number in page_numbers:
+            if (runs and runs[-1][1] == page_number - 1
+                    and (not chunk_size or page_number - runs[-1][0] < chunk_size)):
+                runs[-1] = (runs[-1][0], page_number)
+            else:
+                runs.append((page_number, page_number))
+        return runs
+    
+    def get_text_layer(self, pdf_path, first_page=None, last_page=None):
+        """
+        Read the embedded text layer of a PDF file with poppler's pdftotext.
+    
+        Word boxes are converted from PDF points to pixels at dpi, so they line up with the
+        detections of OCRed pages, and are given a confidence of 1.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            first_page (int, optional): The first page to read, starting at 1. Defaults to the
+                first page of the document.
+            last_page (int, optional): The last page to read, inclusive. Defaults to the last
+                page of the document.
+    
+        Returns:
+            dict: Detections keyed by page number, starting at 1, for the pages with at least
+                  text_layer_min_words words covering at least text_layer_min_coverage of the
+                  page height. Empty if pdftotext isn't available or fails.
+        """
+        with self.metrics.stage('text_layer'):
+            page_range = []
+            if first_page is not None:
+                page_range += ['-f', str(first_page)]
+            if last_page is not None:
+                page_range += ['-l', str(last_page)]
+            try:
+                output = subprocess.run(['pdftotext', '-bbox', '-enc', 'UTF-8', *page_range, pdf_path, '-'],
+                                        capture_output=True, check=True).stdout.decode('utf-8')
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning('Could not read the text layer of %s, OCRing every page: %s', pdf_path, e)
+                return {}
+            scale = self.dpi / 72
+            pages = {}
+            heights = {}
+            page_number = (first_page or 1) - 1
+            for match in _TEXT_LAYER_PATTERN.finditer(output):
+                if match.group('word') is None:
+                    page_number += 1
+                    pages[page_number] = []
+                    heights[page_number] = float(match.group('height') or 0)
+                elif match.group('word').strip():
+                    pages[page_number].append(match.groups()[1:6])
+            text_pages = {}
+            for page_number, words in pages.items():
+                if not words or len(words) < self.text_layer_min_words:
+                    continue
+                boxes = np.array([word[:4] for word in words], dtype=np.float64)
+                # a few words in one band, like a stamp in the margin, don't make a page digital
+                coverage = self.get_vertical_coverage(boxes[:, 1], boxes[:, 3])
+                if heights[page_number] and coverage < self.text_layer_min_coverage * heights[page_number]:
+                    continue
+                boxes *= scale
+                x0, y0, x1, y1 = np.rint(boxes).astype(np.int32).T
+                detections = Detections()
+                detections.coords = np.stack([np.stack([x0, y0], 1), np.stack([x1, y0], 1),
+                                              np.stack([x1, y1], 1), np.stack([x0, y1], 1)], 1)
+                detections.texts = np.empty(len(words), dtype=object)
+                detections.texts[:] = [html.unescape(word[4]) for word in words]
+                detections.confidences = np.ones(len(words), dtype=np.float32)
+                text_pages[page_number] = detections
+        self.metrics.count('text_layer_pages', len(text_pages))
+        return text_pages
+    
+    @staticmethod
+    def get_vertical_coverage(tops, bottoms):
+        """
+        Return how much of a page's height is covered by at least one box.
+    
+        Args:
+            tops (numpy.ndarray): The top edge of each box.
+            bottoms (numpy.ndarray): The bottom edge of each box.
+    
+        Returns:
+            float: The total height of the union of the boxes' vertical extents.
+        """
+        covered = 0.0
+        end = -np.inf
+        for top, bottom in sorted(zip(tops.tolist(), bottoms.tolist())):
+            if bottom <= end:
+                continue
+            covered += bottom - max(top, end)
+            end = bottom
+        return covered
+    
+    def prefetch(self, iterable):
+        """
+        Run an iterable, such as iter_pages, on a background thread up to prefetch_pages items
+        ahead of the caller.
+    
+        The items wait in a queue of prefetch_pages slots, so at most that many rendered pages
+        are held on top of the one being OCRed and the chunk being rendered. Exceptions raised
+        by the iterable are raised to the caller, and the thread stops when the caller stops
+        iterating.
+    
+        Args:
+            iterable (iterable): The items to produce.
+    
+        Yields:
+            object: The items of iterable, in order.
+        """
+        if not self.prefetch_pages:
+            yield from iterable
+            return
+        items = queue.Queue(maxsize=self.prefetch_pages)
+        stop = threading.Event()
+        done = object()
+        call = self.metrics.get_call()
+    
+        def put(item):
+            # give up once the caller has stopped, instead of waiting on a full queue forever
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+    
+        def produce():
+            self.metrics.join_call(call)
+            try:
+                for item in iterable:
+                    if not put((item, None)):
+                        return
+                put((done, None))
+            except BaseException as e:
+                put((done, e))
+    
+        thread = threading.Thread(target=produce, name='easyocr-unstructured-render', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item, error = items.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+            if hasattr(iterable, 'close'):
+                iterable.close()
+    
+    def ocr_image(self, image):
+        """
+        Run OCR on a single page image.
+    
+        Args:
+            image (PIL.Image.Image): The rasterized page.
+    
+        Returns:
+            Detections: The detections found on the page.
+        """
+        return self.ocr_images([image])[0]
+    
+    def get_image_batches(self, images):
+        """
+        Split page images into batches that can be passed to readtext_batched together.
+    
+        Only images of the same size and mode are batched, since easyocr would otherwise
+        resize them, and a batch holds at most page_batch_size images and batch_max_bytes of
+        pixels. A single image larger than batch_max_bytes gets a batch of its own.
+    
+        Args:
+            images (list): numpy arrays of the rasterized pages.
+    
+        Returns:
+            list: Lists of indexes into images, one per batch.
+        """
+        groups = {}
+        for i, image in enumerate(images):
+            groups.setdefault((image.shape, image.dtype.str), []).append(i)
+        batches = []
+        for indexes in groups.values():
+            batch, batch_bytes = [], 0
+            for i in indexes:
+                if batch and (len(batch) >= self.page_batch_size
+                              or batch_bytes + images[i].nbytes > self.batch_max_bytes):
+                    batches.append(batch)
+                    batch, batch_bytes = [], 0
+                batch.append(i)
+                batch_bytes += images[i].nbytes
+            batches.append(batch)
+        return batches
+    
+    def ocr_images(self, images):
+        """
+        Run OCR on page images, batching pages of the same size through the detector.
+    
+        Args:
+            images (list): The rasterized pages.
+    
+        Returns:
+            list: The Detections of each page, in the order of images.
+        """
+        reader = self.get_reader()
+        reader_lock = self.get_reader_lock()
+        arrays = [np.array(image) for image in images]
+        results = [None] * len(arrays)
+        for batch in self.get_image_batches(arrays):
+            # calls from other threads sharing the reader wait here, outside the readtext timing
+            with reader_lock, self.metrics.stage('readtext'), self.inference_context():
+                if len(batch) == 1:
+                    batch_results = [reader.readtext(arrays[batch[0]], batch_size=self.batch_size)]
+                else:
+                    batch_results = reader.readtext_batched([arrays[i] for i in batch], batch_size=self.batch_size)
+            for i in batch:
+                arrays[i] = None
+            with self.metrics.stage('detections'):
+                for i, result in zip(batch, batch_results):
+                    results[i] = Detections.from_readtext(result)
+        self.metrics.count('pages', len(results))
+        self.metrics.count('detections', sum(len(detections) for detections in results))
+        return results
+    
+    def get_page_hash(self, image):
+        """
+        Generate a SHA-1 hash identifying a rendered page and the languages it is read in.
+    
+        Two pages that render to the same pixels get the same hash, wherever they appear.
+    
+        Args:
+            image (PIL.Image.Image): The rasterized page.
+    
+        Returns:
+            str: The hexadecimal representation of the hash.
+        """
+        hash_func = hashlib.sha1()
+        key = (self.lang_list, image.mode, image.size)
+        # unquantized models read pages slightly differently
+        if not self.inference_profile['quantize']:
+            key += ('fp32',)
+        hash_func.update(repr(key).encode('utf-8'))
+        hash_func.update(image.tobytes())
+        return hash_func.hexdigest()
+    
+    def ocr_page(self, image):
+        """
+        OCR a page, reusing the page cache when the same page has been OCRed before.
+    
+        The detections of a newly OCRed page are written to the page cache straight away.
+    
+        Args:
+            image (PIL.Image.Image): The rasterized page.
+    
+        Returns:
+            Detections: The detections found on the page.
+        """
+        return self.ocr_pages([image])[0]
+    
+    def ocr_pages(self, images):
+        """
+        OCR pages like ocr_page, sending every page missing from the page cache to
+        ocr_images in one go so they can be batched.
+    
+        Args:
+            images (list): The rasterized pages.
+    
+        Returns:
+            list: The Detections of each page, in the order of images.
+        """
+        if not self.page_cache:
+            return self.ocr_images(images)
+        page_fps = [self.get_shard_path(self.page_dir, self.get_page_hash(image) + self.CACHE_EXTENSION)
+                    for image in images]
+        results = [self.load_cache(page_fp) for page_fp in page_fps]
+        misses = [i for i, detections in enumerate(results) if detections is None]
+        if len(misses) < len(results):
+            self.metrics.count('page_cache_hits', len(results) - len(misses))
+        if misses:
+            self.metrics.count('page_cache_misses', len(misses))
+            for i, detections in zip(misses, self.ocr_images([images[i] for i in misses])):
+                results[i] = detections
+                self.write_cache(detections, page_fps[i])
+                self.cache_index.record_write(page_fps[i])
+        return results
+    
+    def ocr_rendered_page(self, pdf_path, page_number, image):
+        """
+        OCR a page rendered by render_pages, returning coordinates in pixels at dpi.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            page_number (int): The number of the page, starting at 1.
+            image (PIL.Image.Image): The page as rendered by render_pages.
+    
+        Returns:
+            Detections: The detections found on the page.
+        """
+        return self.ocr_rendered_pages(pdf_path, [page_number], [image])[0]
+    
+    def ocr_rendered_pages(self, pdf_path, page_numbers, images):
+        """
+        OCR pages rendered by render_pages, returning coordinates in pixels at dpi.
+    
+        In adaptive mode the pages were rendered at adaptive_dpi. The pages whose detections
+        aren't confident enough are rendered and OCRed again at dpi, the coordinates of the
+        others are scaled up to dpi.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            page_numbers (list): The number of each page, starting at 1.
+            images (list): The pages as rendered by render_pages.
+    
+        Returns:
+            list: The Detections of each page, in the order of images.
+        """
+        results = self.ocr_pages(images)
+        if not self.adaptive_dpi or self.adaptive_dpi == self.dpi:
+            return results
+        retry = [i for i, detections in enumerate(results)
+                 if len(detections) == 0 or float(np.mean(detections.confidences)) < self.adaptive_min_confidence]
+        for i, detections in enumerate(results):
+            results[i] = detections.scaled(self.dpi / self.adaptive_dpi)
+        if retry:
+            self.metrics.count('pages_rerendered', len(retry))
+            images = [self.render_pages(pdf_path, first_page=page_numbers[i], last_page=page_numbers[i], dpi=self.dpi)[0]
+                      for i in retry]
+            for i, detections in zip(retry, self.ocr_pages(images)):
+                results[i] = detections
+        return results
+    
     def scan_pdf(self, pdf_path):
         """Scan a PDF file and extract text from its pages using the EasyOCR library.
     
+        Pages are OCRed in a process pool when workers is greater than 1, otherwise one after
+        another in this process. Both paths return the same entries in the same order.
+    
         Args:
             pdf_path (str): The path to the PDF file to be scanned.
     
@@ -94,14 +1660,284 @@ class EasyocrUnstructured:
                   Each entry in the list is a list containing the bounding box coordinates
                   followed by the extracted text.
         """    
-        reader = easyocr.Reader(['en'])  # Specify the language(s) you want to use
-        images = pdf2image.convert_from_path(pdf_path)
-        results = []
-        for image in images:
-            detections = reader.readtext(np.array(image))
-            for entry in detections:
-                results.append(self.get_new_entry(entry))
-        return results
+        return self.scan_detections(pdf_path).to_entries()
+    
+    def scan_detections(self, pdf_path, selection=None):
+        """
+        Scan a PDF file like scan_pdf but return the detections in columnar form.
+    
+        Args:
+            pdf_path (str or bytes): The path to the PDF file to be scanned, or its contents,
+                see spooled_document.
+            selection (tuple, optional): The pages and regions to scan, as returned by
+                get_selection. Defaults to every page in full.
+    
+        Returns:
+            Detections: The detections of every page in page order.
+        """
+        with self.spooled_document(pdf_path) as pdf_path:
+            if selection is not None:
+                return self.scan_selection(pdf_path, selection)
+            text_pages = self.get_text_layer(pdf_path) if self.text_layer else {}
+            return Detections.concatenate(self.iter_page_detections(pdf_path, text_pages))
+    
+    def get_selection(self, pages=None, regions=None):
+        """
+        Normalise the pages and regions a caller asked for into a hashable selection.
+    
+        Args:
+            pages (iterable, optional): Page numbers, starting at 1. Defaults to every page, or
+                to the pages of regions if it is a dict.
+            regions (list or dict, optional): (x0, y0, x1, y1) boxes in pixels at dpi, the
+                coordinate space of the results. A list applies to every selected page, a dict
+                maps page numbers to their own list. Pages without regions are read in full.
+                An empty list or dict is the same as None.
+    
+        Returns:
+            tuple: (pages, regions), pages a sorted tuple of page numbers or None for every
+                   page, and regions None or a sorted tuple of (page, boxes) pairs, page 0
+                   standing for every page. None if nothing was selected.
+    
+        Raises:
+            ValueError: If a region isn't a box with x0 < x1 and y0 < y1.
+        """
+        def normalise(boxes):
+            boxes = tuple(tuple(int(v) for v in box) for box in boxes)
+            for box in boxes:
+                if len(box) != 4 or box[0] >= box[2] or box[1] >= box[3]:
+                    raise ValueError(f'regions must be (x0, y0, x1, y1) boxes with x0 < x1 and y0 < y1, not {box!r}')
+            return boxes
+    
+        if pages is not None:
+            pages = tuple(sorted({int(page) for page in pages}))
+        if isinstance(regions, dict) and regions:
+            regions = tuple(sorted((int(page), normalise(boxes)) for page, boxes in regions.items()))
+            if pages is None:
+                pages = tuple(page for page, _ in regions)
+        elif regions:
+            regions = ((0, normalise(regions)),)
+        else:
+            regions = None
+        if pages is None and regions is None:
+            return None
+        return pages, regions
+    
+    def scan_selection(self, pdf_path, selection):
+        """
+        Scan only the selected pages of a PDF file, and only the selected regions of them.
+    
+        Selected pages are rendered with first_page/last_page in consecutive runs. A page with
+        regions is rendered at dpi and only its regions are cropped out and OCRed, each through
+        the page cache, with the results moved back to page coordinates. Pages read from the
+        text layer keep the words whose centre is inside a region.
+    
+        Args:
+            pdf_path (str): The path to the PDF file to be scanned.
+            selection (tuple): The pages and regions to scan, as returned by get_selection.
+    
+        Returns:
+            Detections: The detections of the selected pages in page order, one page each.
+    
+        Raises:
+            ValueError: If a selected page isn't in the document.
+        """
+        pages, regions = selection
+        page_count = self.get_page_count(pdf_path)
+        if pages is None:
+            pages = tuple(range(1, page_count + 1))
+        for page_number in pages:
+            if not 1 <= page_number <= page_count:
+                raise ValueError(f'{pdf_path} has no page {page_number}, it has {page_count} pages')
+        page_regions = dict(regions or ())
+        if 0 in page_regions:
+            page_regions = dict.fromkeys(pages, page_regions[0])
+        # only the selected range of the text layer is read
+        text_pages = self.get_text_layer(pdf_path, min(pages), max(pages)) if self.text_layer and pages else {}
+        full = [page_number for page_number in pages if page_number not in text_pages and page_number not in page_regions]
+        cropped = [page_number for page_number in pages if page_number not in text_pages and page_number in page_regions]
+        results = dict(self.iter_ocr_batches(pdf_path, zip(full, self.prefetch(self.iter_pages(pdf_path, full)))))
+        for page_number, image in zip(cropped, self.prefetch(self.iter_pages(pdf_path, cropped, dpi=self.dpi))):
+            results[page_number] = self.ocr_regions(image, page_regions[page_number])
+        for page_number in pages:
+            if page_number in text_pages:
+                boxes = page_regions.get(page_number)
+                results[page_number] = text_pages[page_number].within(boxes) if boxes else text_pages[page_number]
+        return Detections.concatenate(results[page_number] for page_number in pages)
+    
+    def ocr_regions(self, image, boxes):
+        """
+        OCR regions of a page rendered at dpi.
+    
+        Args:
+            image (PIL.Image.Image): The page.
+            boxes (tuple): (x0, y0, x1, y1) boxes in pixels. Boxes are clipped to the page.
+    
+        Returns:
+            Detections: The detections of every region in page coordinates, region by region.
+        """
+        boxes = [(max(x0, 0), max(y0, 0), min(x1, image.width), min(y1, image.height)) for x0, y0, x1, y1 in boxes]
+        boxes = [box for box in boxes if box[0] < box[2] and box[1] < box[3]]
+        crops = [image.crop(box) for box in boxes]
+        parts = self.ocr_pages(crops) if crops else []
+        return Detections.concatenate(part.shifted(box[0], box[1]) for part, box in zip(parts, boxes))
+    
+    def iter_page_detections(self, pdf_path, text_pages=None):
+        """
+        Yield the detections of each page of a PDF file in page order.
+    
+        Pages found in text_pages are taken from there and aren't rasterized at all, every
+        other page is rendered and OCRed, on the worker processes when workers is greater
+        than 1.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            text_pages (dict, optional): Detections read from the text layer, keyed by page
+                number, as returned by get_text_layer.
+    
+        Yields:
+            Detections: The detections of one page.
+        """
+        if self.workers > 1:
+            yield from self.iter_page_detections_parallel(pdf_path, text_pages)
+            return
+        if not text_pages:
+            pages = enumerate(self.prefetch(self.iter_pages(pdf_path)), 1)
+        else:
+            page_count = self.get_page_count(pdf_path)
+            page_numbers = [page_number for page_number in range(1, page_count + 1) if page_number not in text_pages]
+            pages = zip(page_numbers, self.prefetch(self.iter_pages(pdf_path, page_numbers)))
+        next_page = 1
+        for page_number, detections in self.iter_ocr_batches(pdf_path, pages):
+            while next_page < page_number:
+                yield text_pages[next_page]
+                next_page += 1
+            yield detections
+            next_page = page_number + 1
+        if text_pages:
+            while next_page <= page_count:
+                yield text_pages[next_page]
+                next_page += 1
+    
+    def iter_ocr_batches(self, pdf_path, pages):
+        """
+        OCR rendered pages page_batch_size at a time.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            pages (iterable): (page number, image) tuples in page order.
+    
+        Yields:
+            tuple: The page number and the Detections of each page, in page order.
+        """
+        batch = []
+        for page in pages:
+            batch.append(page)
+            if len(batch) >= self.page_batch_size:
+                page_numbers, images = zip(*batch)
+                batch = []
+                yield from zip(page_numbers, self.ocr_rendered_pages(pdf_path, page_numbers, images))
+        if batch:
+            page_numbers, images = zip(*batch)
+            yield from zip(page_numbers, self.ocr_rendered_pages(pdf_path, page_numbers, images))
+    
+    def get_worker_options(self):
+        """
+        Return the constructor arguments a worker process needs to OCR pages like this object.
+    
+        Returns:
+            dict: Keyword arguments for EasyocrUnstructured.
+        """
+        # a worker scanning a whole document renders and batches its pages like this object,
+        # so a long document doesn't have to fit in a worker's memory at once
+        return {'lang_list': self.lang_list, 'gpu': self.gpu, 'page_cache': self.page_cache,
+                'page_chunk_size': self.page_chunk_size, 'page_batch_size': self.page_batch_size,
+                'batch_max_bytes': self.batch_max_bytes,
+                'cache_max_bytes': self.cache_index.max_bytes,
+                'cache_max_age_days': self.cache_index.max_age_days,
+                'cache_policy': self.cache_index.policy, 'dpi': self.dpi, 'grayscale': self.grayscale,
+                'adaptive_dpi': self.adaptive_dpi, 'adaptive_min_confidence': self.adaptive_min_confidence,
+                'text_layer': self.text_layer, 'text_layer_min_words': self.text_layer_min_words,
+                'text_layer_min_coverage': self.text_layer_min_coverage,
+                'batch_size': self.batch_size, 'cache_dir': self.output_dir,
+                'prefetch_pages': self.prefetch_pages, 'inference_profile': self.inference_profile}
+    
+    def get_executor(self):
+        """
+        Return the process pool used for parallel scans, starting it if needed.
+    
+        Workers are started with the spawn method, which is safe to use alongside torch's
+        own threads, and each loads its reader once when it starts.
+    
+        Returns:
+            concurrent.futures.ProcessPoolExecutor: The process pool.
+        """
+        if self._executor is None:
+            torch_threads = self.torch_threads or max(1, (os.cpu_count() or 1) // self.workers)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_page_worker,
+                                                 initargs=(self.get_worker_options(), torch_threads))
+        return self._executor
+    
+    def close(self):
+        """
+        Shut down the process pool used for parallel scans and the executors used by
+        ainvoke, if they were started.
+    
+        Returns:
+            None
+        """
+        for name in ('_executor', '_io_executor', '_ocr_executor'):
+            executor = getattr(self, name)
+            if executor is not None:
+                executor.shutdown()
+                setattr(self, name, None)
+    
+    def scan_pdf_parallel(self, pdf_path, text_pages=None):
+        """
+        Scan a PDF file with its pages spread across the worker processes.
+    
+        Each worker rasterizes and OCRs the pages it is given, so only page numbers and
+        detections cross the process boundary. Results are merged back in page order.
+    
+        Args:
+            pdf_path (str): The path to the PDF file to be scanned.
+            text_pages (dict, optional): Detections read from the text layer, keyed by page
+                number. These pages aren't sent to the workers.
+    
+        Returns:
+            Detections: The same detections scan_detections returns in serial mode.
+        """
+        return Detections.concatenate(self.iter_page_detections_parallel(pdf_path, text_pages))
+    
+    def iter_page_detections_parallel(self, pdf_path, text_pages=None):
+        """
+        Yield the detections of each page of a PDF file in page order, OCRing the pages on the
+        worker processes.
+    
+        Every page is submitted at once and each is yielded as soon as it and the pages
+        before it are done.
+    
+        Args:
+            pdf_path (str): The path to the PDF file.
+            text_pages (dict, optional): Detections read from the text layer, keyed by page
+                number. These pages aren't sent to the workers.
+    
+        Yields:
+            Detections: The detections of one page.
+        """
+        text_pages = text_pages or {}
+        page_count = self.get_page_count(pdf_path)
+        pages = [page_number for page_number in range(1, page_count + 1) if page_number not in text_pages]
+        results = self.get_executor().map(_ocr_page_worker, repeat(pdf_path), pages)
+        for page_number in range(1, page_count + 1):
+            if page_number in text_pages:
+                yield text_pages[page_number]
+                continue
+            detections = next(results)
+            self.metrics.count('pages')
+            self.metrics.count('detections', len(detections))
+            yield detections
     
     def add_new_entry(self, current_group, entries_processed, bbox, entries, entry, i, last_text):
         """
@@ -141,7 +1977,7 @@ class EasyocrUnstructured:
         are close enough (within the specified threshold) are grouped together.
     
         Args:
-            entries (list): A list of entries, where each entry is expected 
+            entries (list or Detections): A list of entries, where each entry is expected 
                 to contain bounding box coordinates and text.
             proximity_threshold (int): The distance threshold for grouping 
                 entries based on their bounding boxes.
@@ -153,6 +1989,8 @@ class EasyocrUnstructured:
                 - entries_processed (list): A list of entries that have been 
                   processed during the grouping.
         """
+        if isinstance(entries, Detections):
+            entries = entries.to_entries()
         grouped_results = []
         current_group = []
         last_bbox = None
@@ -196,12 +2034,115 @@ class EasyocrUnstructured:
                 last_miss = bbox
         return grouped_results, entries_processed
     
+    def group_boxes(self, coords, texts, proximity_threshold, complete=False):
+        """
+        Group bounding boxes by proximity without recursion or list removal.
+    
+        This produces exactly the groups of the original recursive algorithm, which sorted
+        the entries, ran group_entries over them, removed every processed entry from the list
+        and recursed on what was left. Here each of those recursion levels is a pass over the
+        same sorted order:
+    
+        - the boxes stay in a NumPy coordinate array and are visited through a sort index
+        - processed boxes are marked in a boolean mask instead of being removed
+        - a forward skip index with path compression jumps over processed boxes, so a pass
+          never touches a box an earlier pass consumed
+        - when a pass skips a box on the row of the last miss, every later box on that row
+          would be skipped too, so the pass jumps straight to the next row
+    
+        Every box is consumed once and each pass skips at most one row more than the boxes
+        it consumes, so after the sort the work is linear in the number of boxes.
+    
+        Args:
+            coords (numpy.ndarray): An (N, 4, 2) array of bounding box corner points.
+            texts (list): The N texts belonging to the boxes.
+            proximity_threshold (int): The distance threshold for grouping boxes.
+            complete (bool, optional): Keep the group of a pass that reaches the last box
+                without a miss, which the original algorithm drops, and don't add the empty
+                last group. Defaults to False.
+    
+        Returns:
+            list: A list of groups, each a list of indices into coords. As with the original
+                  algorithm the last group of a document is always an empty list, unless
+                  complete is set.
+        """
+        n = len(coords)
+        if n == 0:
+            return [] if complete else [[]]
+        coords = np.asarray(coords)
+        # stable sort by top left y then x, the same order as the original list.sort
+        order = np.lexsort((coords[:, 0, 0], coords[:, 0, 1]))
+        left = coords[order, 0, 0].tolist()
+        top = coords[order, 0, 1].tolist()
+        right = coords[order, 1, 0].tolist()
+        bottom = coords[order, 2, 1].tolist()
+        texts = [texts[i] for i in order.tolist()]
+        order = order.tolist()
+        # first position of the next row for every position
+        row_starts = np.flatnonzero(np.diff(coords[:, 0, 1][np.asarray(order)])) + 1
+        next_row = np.append(row_starts, n)[np.searchsorted(row_starts, np.arange(n), side='right')].tolist()
+    
+        processed = bytearray(n)
+        # skip[i] points at or before the next unprocessed position after a processed position i
+        skip = list(range(1, n + 1))
+    
+        def first_unprocessed(position):
+            found = position
+            while found < n and processed[found]:
+                found = skip[found]
+            while position < found and processed[position]:
+                skip[position], position = found, skip[position]
+            return found
+    
+        grouped_results = []
+        start = first_unprocessed(0)
+        # each iteration is one level of the original recursion
+        while start < n:
+            current_group = [order[start]]
+            processed[start] = 1
+            last_box = last_line = start
+            last_miss_top = top[start]
+            last_text = texts[start]
+            position = first_unprocessed(start + 1)
+            while position < n:
+                if (left[position] <= right[last_box] + proximity_threshold and
+                        top[position] <= bottom[last_box] + proximity_threshold):
+                    last_box = position
+                elif (top[position] <= top[last_line] + proximity_threshold and
+                      left[position] <= left[last_line] + proximity_threshold):
+                    last_box = last_line = position
+                    last_miss_top = top[position]
+                elif top[position] != last_miss_top:
+                    grouped_results.append(current_group)
+                    break
+                else:
+                    # the rest of this row would be skipped as well
+                    position = first_unprocessed(next_row[position])
+                    continue
+                # the box joins the group, repeated texts are consumed but not repeated
+                if texts[position] != last_text:
+                    current_group.append(order[position])
+                last_text = texts[position]
+                processed[position] = 1
+                position = first_unprocessed(position + 1)
+            else:
+                if complete:
+                    grouped_results.append(current_group)
+            start = first_unprocessed(start)
+        # the final pass never ends on a miss, so its group is dropped and an empty one added
+        if not complete:
+            grouped_results.append([])
+        return grouped_results
+    
     def process_entries(self, entries, proximity_in_pixels):
         """Group text entries based on their proximity to each other.
         
+            The entries list is not modified.
+        
             Args:
-                entries (list): A list of entries, where each entry is a list containing
-                    a list of 4 2 dimensional bounding box coordinates and extracted text.
+                entries (list or Detections): A list of entries, where each entry is a list
+                    containing a list of 4 2 dimensional bounding box coordinates and extracted
+                    text, or the same entries in columnar form.
                 proximity_threshold (int): The threshold distance (in pixels) to consider
                                            entries as being in proximity to each other.
         
@@ -209,20 +2150,32 @@ class EasyocrUnstructured:
                 list: A list of grouped entries, where each group is a list of strings
                       that are close to each other based on the specified proximity threshold.
             """    
-        entries.sort(key=lambda x: (x[0][1], x[0][0]))
+        if isinstance(entries, Detections):
+            groups = self.group_boxes(entries.coords, entries.texts, proximity_in_pixels)
+            entries = entries.to_entries()
+        else:
+            coords = np.array([entry[:4] for entry in entries]).reshape(-1, 4, 2)
+            texts = [entry[4] for entry in entries]
+            groups = self.group_boxes(coords, texts, proximity_in_pixels)
+        return [[entries[i] for i in group] for group in groups]
     
-        grouped_results, entries_processed = self.group_entries(entries, proximity_in_pixels)
-                    
-        for entry in entries_processed:
-            entries.remove(entry)
-        
-        if len(entries) > 0:
-            more_entries = self.process_entries(entries, proximity_in_pixels)
-            grouped_results.extend(more_entries)
-        if len(grouped_results) == 0:
-            grouped_results.append(list())
-        
-        return grouped_results
+    def group_texts(self, detections, proximity_in_pixels, complete=False):
+        """
+        Group detections by proximity and keep only their text.
+    
+        Args:
+            detections (Detections): The detections to group.
+            proximity_in_pixels (int): The threshold distance (in pixels) to consider
+                                       detections as being in proximity to each other.
+            complete (bool, optional): Keep every group, see group_boxes. Defaults to False.
+    
+        Returns:
+            list: A list of groups, each a list of the strings in the group.
+        """
+        with self.metrics.stage('grouping'):
+            texts = detections.texts.tolist()
+            groups = self.group_boxes(detections.coords, texts, proximity_in_pixels, complete)
+            return [[texts[i] for i in group] for group in groups]
     
     def pdf_to_json(self, pdf_fp, output_fp):
         """
@@ -238,69 +2191,1046 @@ class EasyocrUnstructured:
                 list: A list of entries extracted from the PDF.
             """    
         entries = self.scan_pdf(pdf_fp)
-        with open(output_fp, 'w') as f:
+        with self.atomic_write(output_fp, 'w') as f:
             json.dump(entries, f)
         return entries
     
+    def pdf_to_detections(self, pdf_fp, output_fp, selection=None):
+        """
+        Scan a PDF file and save its detections to a binary cache file.
+    
+        Args:
+            pdf_fp (str): The file path to the PDF file to be scanned.
+            output_fp (str): The file path of the cache file.
+            selection (tuple, optional): The pages and regions to scan, see get_selection.
+    
+        Returns:
+            Detections: The detections extracted from the PDF.
+        """
+        detections = self.scan_detections(pdf_fp, selection)
+        with self.metrics.stage('cache_write'):
+            self.write_cache(detections, output_fp)
+            self.cache_index.record_write(output_fp)
+        return detections
+    
+    def write_cache(self, detections, output_fp):
+        """
+        Save detections to a binary cache file.
+    
+        The file is a one dimensional uint8 .npy array so it can be memory mapped with
+        np.load(mmap_mode='r'). Its data is made of 8 byte aligned sections:
+    
+        - header: int64 magic number, format version, detection count N, text blob size and
+          page count P, 0 if the page boundaries aren't known
+        - coords: N x 4 x 2 int32 corner points
+        - confidences: N float32 confidences, padded to a multiple of 8 bytes
+        - offsets: N + 1 int64 offsets of each text in the blob
+        - pages: P + 1 int64 offsets of the detections of each page, empty if P is 0
+        - blob: the UTF-8 encoded texts, one after another
+    
+        Version 1 files have no page count in their header and no pages section. They are
+        still read, without page boundaries.
+    
+        Args:
+            detections (Detections): The detections to save.
+            output_fp (str): The file path of the cache file.
+    
+        Returns:
+            None
+        """
+        n = len(detections)
+        encoded = [text.encode('utf-8') for text in detections.texts.tolist()]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in encoded], out=offsets[1:])
+        blob = b''.join(encoded)
+        page_count = 0 if detections.page_offsets is None else len(detections.page_offsets) - 1
+        sections = self.get_cache_sections(n, len(blob), page_count)
+        buffer = np.zeros(sections['blob'][1], dtype=np.uint8)
+        buffer[slice(*sections['header'])].view(np.int64)[:] = [self.CACHE_MAGIC, self.CACHE_VERSION, n,
+                                                                len(blob), page_count]
+        if page_count:
+            buffer[slice(*sections['pages'])].view(np.int64)[:] = detections.page_offsets
+        buffer[slice(*sections['coords'])].view(np.int32)[:] = detections.coords.reshape(-1)
+        confidences_start = sections['confidences'][0]
+        buffer[confidences_start:confidences_start + n * 4].view(np.float32)[:] = detections.confidences
+        buffer[slice(*sections['offsets'])].view(np.int64)[:] = offsets
+        buffer[slice(*sections['blob'])] = np.frombuffer(blob, dtype=np.uint8)
+        with self.atomic_write(output_fp, 'wb') as f:
+            np.save(f, buffer)
+    
+    @contextlib.contextmanager
+    def atomic_write(self, output_fp, mode):
+        """
+        Open a temporary file next to output_fp and move it into place once it is complete.
+    
+        Readers in this or any other process only ever see no file or the whole file. The
+        temporary file is flushed to disk before it is renamed, so a crash can't leave an
+        empty file in its place, and it is removed if writing fails.
+    
+        Args:
+            output_fp (str): The file path to write.
+            mode (str): 'w' or 'wb'.
+    
+        Yields:
+            file: The open temporary file.
+        """
+        directory = os.path.dirname(output_fp)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_fp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(output_fp) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode) as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_fp, output_fp)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_fp)
+            raise
+    
+    @staticmethod
+    def get_cache_sections(n, blob_size, page_count=None):
+        """
+        Return the byte ranges of the sections of a binary cache file.
+    
+        Args:
+            n (int): The number of detections.
+            blob_size (int): The size of the text blob in bytes.
+            page_count (int, optional): The number of pages, 0 if unknown. None for the
+                version 1 layout.
+    
+        Returns:
+            dict: The (start, stop) byte range of each section, keyed by section name.
+        """
+        if page_count is None:
+            sizes = [('header', 32)]
+        else:
+            sizes = [('header', 40)]
+        sizes += [('coords', n * 32), ('confidences', (n * 4 + 7) // 8 * 8), ('offsets', (n + 1) * 8)]
+        if page_count:
+            sizes.append(('pages', (page_count + 1) * 8))
+        sizes.append(('blob', blob_size))
+        sections = {}
+        start = 0
+        for name, size in sizes:
+            sections[name] = (start, start + size)
+            start += size
+        return sections
+    
+    def read_cache(self, cache_fp):
+        """
+        Load detections from a binary cache file written by write_cache.
+    
+        The file is memory mapped, the coordinate and confidence arrays of the returned
+        detections are read-only views of it and only the texts are decoded.
+    
+        Args:
+            cache_fp (str): The file path of the cache file.
+    
+        Returns:
+            Detections: The cached detections.
+    
+        Raises:
+            ValueError: If the file is not a cache file of a known version or is truncated.
+        """
+        raw = np.load(cache_fp, mmap_mode='r')
+        if raw.dtype != np.uint8 or raw.ndim != 1 or len(raw) < 32:
+            raise ValueError(f'{cache_fp} is not an OCR cache file')
+        magic, version, n, blob_size = raw[:32].view(np.int64).tolist()
+        if magic != self.CACHE_MAGIC or version not in (1, self.CACHE_VERSION):
+            raise ValueError(f'{cache_fp} is not a version {self.CACHE_VERSION} OCR cache file')
+        page_count = None
+        if version > 1:
+            if len(raw) < 40:
+                raise ValueError(f'{cache_fp} is truncated')
+            page_count = int(raw[32:40].view(np.int64)[0])
+        sections = self.get_cache_sections(n, blob_size, page_count)
+        if len(raw) != sections['blob'][1]:
+            raise ValueError(f'{cache_fp} is truncated')
+        detections = Detections()
+        if page_count:
+            detections.page_offsets = raw[slice(*sections['pages'])].view(np.int64)
+        detections.coords = raw[slice(*sections['coords'])].view(np.int32).reshape(n, 4, 2)
+        confidences_start = sections['confidences'][0]
+        detections.confidences = raw[confidences_start:confidences_start + n * 4].view(np.float32)
+        offsets = raw[slice(*sections['offsets'])].view(np.int64).tolist()
+        blob = raw[slice(*sections['blob'])].tobytes()
+        detections.texts = np.empty(n, dtype=object)
+        detections.texts[:] = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n)]
+        return detections
+    
+    def load_cache(self, output_fp, sharded=True):
+        """
+        Load cached detections, migrating a legacy JSON cache file to the binary format.
+    
+        Args:
+            output_fp (str): The file path of the binary cache file. The legacy JSON file has
+                the same path with the LEGACY_CACHE_EXTENSION extension.
+            sharded (bool, optional): output_fp is in a shard directory, so a file written
+                before the cache was sharded is looked for one directory up. Defaults to True.
+    
+        Returns:
+            Detections: The cached detections, or None if there is no usable cache file.
+        """
+        if os.path.exists(output_fp) or (sharded and self.migrate_unsharded_cache(output_fp)):
+            try:
+                detections = self.read_cache(output_fp)
+            except (OSError, ValueError, EOFError):
+                # np.load raises EOFError on an empty file
+                return None
+            self.cache_index.record_access(output_fp)
+            return detections
+        legacy_fp = os.path.splitext(output_fp)[0] + self.LEGACY_CACHE_EXTENSION
+        if not os.path.exists(legacy_fp):
+            return None
+        try:
+            with open(legacy_fp, 'r') as f:
+                detections = Detections.from_entries(json.load(f))
+        except (OSError, ValueError):
+            return None
+        self.write_cache(detections, output_fp)
+        self.cache_index.record_write(output_fp)
+        os.remove(legacy_fp)
+        self.cache_index.remove(legacy_fp)
+        return detections
+    
+    def migrate_unsharded_cache(self, cache_fp):
+        """
+        Move a cache file written before the cache was sharded into its shard directory.
+    
+        Args:
+            cache_fp (str): The sharded path of the cache file.
+    
+        Returns:
+            bool: True if a file was moved to cache_fp.
+        """
+        shard_dir, name = os.path.split(cache_fp)
+        flat_fp = os.path.join(os.path.dirname(shard_dir), name)
+        if not os.path.exists(flat_fp):
+            return False
+        os.makedirs(shard_dir, exist_ok=True)
+        try:
+            os.replace(flat_fp, cache_fp)
+        except FileNotFoundError:
+            # another process moved it first
+            return os.path.exists(cache_fp)
+        self.cache_index.remove(flat_fp)
+        self.cache_index.record_write(cache_fp)
+        return True
+    
     def get_hash(self, pdf_fp):
         """
-            Generate a SHA-1 hash for the specified PDF file.
+            Generate a hash of the contents of the specified PDF file.
         
             This function reads the PDF file in binary mode and computes its 
-            SHA-1 hash to create a unique identifier for the file.
+            hash with the configured hasher to create a unique identifier for
+            the file. When trust_file_stat is set and the file's size,
+            modification time and inode match the last time it was hashed,
+            the recorded digest is returned without reading the file.
+            The contents of a PDF held in memory are hashed directly, giving
+            the same digest as the file they were read from.
         
             Args:
-                pdf_fp (str): The file path to the PDF file.
+                pdf_fp (str or bytes): The file path to the PDF file, or its
+                    contents as bytes, a bytearray or a memoryview.
         
             Returns:
-                str: The hexadecimal representation of the SHA-1 hash of the file.
+                str: The hexadecimal representation of the hash of the file.
             """    
-        hash_func = hashlib.sha1()
-        with open(pdf_fp, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_func.update(chunk)
+        if not self.is_path(pdf_fp):
+            hash_func = hashlib.new(self.hasher) if isinstance(self.hasher, str) else self.hasher()
+            with self.metrics.stage('hash'):
+                hash_func.update(pdf_fp)
+            self.metrics.count('bytes_hashed', memoryview(pdf_fp).nbytes)
+            return hash_func.hexdigest()
+        algorithm = self.hasher if isinstance(self.hasher, str) else getattr(self.hasher, '__name__', repr(self.hasher))
+        if self.trust_file_stat:
+            path = os.path.abspath(pdf_fp)
+            stat = os.stat(path)
+            signature = f'{stat.st_size}:{stat.st_mtime_ns}:{stat.st_dev}:{stat.st_ino}'
+            hash_value = self.cache_index.get_file_digest(path, algorithm, signature)
+            if hash_value is not None:
+                return hash_value
+        hash_func = hashlib.new(self.hasher) if isinstance(self.hasher, str) else self.hasher()
+        with self.metrics.stage('hash'), open(pdf_fp, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if self.hash_mmap and file_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hash_func.update(mapped)
+            else:
+                buffer = bytearray(self.hash_buffer_size)
+                view = memoryview(buffer)
+                for size in iter(lambda: f.readinto(buffer), 0):
+                    hash_func.update(view[:size])
+        self.metrics.count('bytes_hashed', file_size)
         hash_value = hash_func.hexdigest()
+        if self.trust_file_stat:
+            self.cache_index.set_file_digest(path, algorithm, signature, hash_value)
         return hash_value
     
-    def invoke(self, pdf_fp, proximity_in_pixels=20):
+    def get_settings_tag(self):
+        """
+        Return a tag identifying the OCR settings that change what a scan produces.
+    
+        Returns:
+            str: An empty string for the default settings, so caches written before these
+                 settings existed stay valid, otherwise '-' and a short hash of the settings.
+        """
+        settings = (self.lang_list, self.dpi, self.grayscale, self.adaptive_dpi,
+                    self.adaptive_min_confidence if self.adaptive_dpi else None)
+        if self.text_layer:
+            settings += (self.text_layer_min_words, self.text_layer_min_coverage)
+        if not self.inference_profile['quantize']:
+            settings += ('fp32',)
+        if settings == (['en'], 200, False, None, None):
+            return ''
+        return '-' + hashlib.sha1(repr(settings).encode('utf-8')).hexdigest()[:12]
+    
+    @staticmethod
+    def get_shard_path(directory, name):
+        """
+        Return the path of a cache file in its shard, the subdirectory of directory named
+        after the first two characters of the file name.
+    
+        Cache files are named after hex digests, so this spreads them evenly over 256
+        subdirectories and keeps any one directory small.
+    
+        Args:
+            directory (str): The cache directory.
+            name (str): The file name, starting with a hex digest.
+    
+        Returns:
+            str: The path of the file.
+        """
+        return os.path.join(directory, name[:2], name)
+    
+    def get_cache_path(self, hash_value, selection=None):
+        """
+        Return the path of the cache file for a document.
+    
+        The file is named after the document's digest, the OCR settings and the selected pages
+        and regions only, so the same PDF is found in the cache whatever it is called and
+        wherever it is stored.
+    
+        Args:
+            hash_value (str): The digest of the document.
+            selection (tuple, optional): The pages and regions scanned, see get_selection.
+    
+        Returns:
+            str: The path of the cache file.
+        """
+        name = hash_value + self.get_settings_tag()
+        if selection is not None:
+            name += '-sel' + hashlib.sha1(repr(selection).encode('utf-8')).hexdigest()[:12]
+        return self.get_shard_path(self.output_dir, name + self.CACHE_EXTENSION)
+    
+    @contextlib.contextmanager
+    def get_cache_lock(self, output_fp):
+        """
+        Hold the inter-process lock guarding the scan of the document cached at output_fp.
+    
+        The lock is a file next to the cache file. It is deleted by its holder just before
+        the lock is released, so lock files don't pile up in the shards. That is safe because
+        every caller checks the cache again once it has the lock: a caller that was already
+        waiting on the deleted file, and one that creates a new file, both find the result
+        the holder saved.
+    
+        Args:
+            output_fp (str): The file path of the cache file.
+    
+        Yields:
+            None
+        """
+        os.makedirs(os.path.dirname(output_fp), exist_ok=True)
+        lock_fp = output_fp + '.lock'
+        with filelock.FileLock(lock_fp):
+            try:
+                yield
+            finally:
+                # an open file can't be deleted on Windows, it is then left for the next holder
+                with contextlib.suppress(OSError):
+                    os.remove(lock_fp)
+    
+    def scan_and_store(self, pdf_fp, hash_value, selection=None):
+        """
+        Scan a document and save its detections to the cache, unless another thread or process
+        does it first.
+    
+        The scan runs under the document's cache lock. A caller that has to wait for the lock
+        reads the result of the scan it waited on instead of scanning the document again.
+    
+        Args:
+            pdf_fp (str): The file path to the PDF file.
+            hash_value (str): The digest of the PDF file.
+            selection (tuple, optional): The pages and regions to scan, see get_selection.
+    
+        Returns:
+            Detections: The detections of the document.
+        """
+        output_fp = self.get_cache_path(hash_value, selection)
+        with self.get_cache_lock(output_fp):
+            detections = self.load_cache(output_fp)
+            if detections is None:
+                detections = self.pdf_to_detections(pdf_fp, output_fp, selection)
+        return detections
+    
+    def migrate_legacy_cache(self, pdf_fp, hash_value, output_fp):
+        """
+        Move a cache file written under the old '<sha1><pdf name>' naming scheme to its
+        content addressed path.
+    
+        The old scheme lost the hash for any path with a directory in it, leaving files that
+        could belong to any PDF of the same name. Only files whose name still starts with
+        the SHA-1 of the document are trusted.
+    
+        Args:
+            pdf_fp (str): The file path of the PDF file.
+            hash_value (str): The SHA-1 digest of the document.
+            output_fp (str): The content addressed path of the cache file.
+    
+        Returns:
+            Detections: The cached detections, or None if there is no usable legacy file.
+        """
+        legacy_name = os.path.split(hash_value + os.path.splitext(pdf_fp)[0])[-1]
+        if legacy_name == hash_value or not legacy_name.startswith(hash_value):
+            return None
+        legacy_fp = os.path.join(self.output_dir, legacy_name + self.CACHE_EXTENSION)
+        # legacy files sit at the top of the cache directory, not in a shard
+        detections = self.load_cache(legacy_fp, sharded=False)
+        if detections is None:
+            return None
+        os.makedirs(os.path.dirname(output_fp), exist_ok=True)
+        os.replace(legacy_fp, output_fp)
+        self.cache_index.remove(legacy_fp)
+        self.cache_index.record_write(output_fp)
+        return detections
+    
+    def store_detections(self, detections, hash_value):
+        """
+        Save the detections of a document to its cache file.
+    
+        Args:
+            detections (Detections): The detections of the document.
+            hash_value (str): The digest of the PDF file.
+    
+        Returns:
+            None
+        """
+        output_fp = self.get_cache_path(hash_value)
+        with self.metrics.stage('cache_write'):
+            self.write_cache(detections, output_fp)
+            self.cache_index.record_write(output_fp)
+    
+    def get_cached_detections(self, pdf_fp, hash_value, selection=None):
+        """
+        Return the cached detections of a document, if it has been scanned before.
+    
+        Args:
+            pdf_fp (str): The file path to the PDF file.
+            hash_value (str): The digest of the PDF file.
+            selection (tuple, optional): The pages and regions scanned, see get_selection.
+    
+        Returns:
+            Detections: The cached detections, or None on a cache miss.
+        """
+        output_fp = self.get_cache_path(hash_value, selection)
+        with self.metrics.stage('cache_lookup'):
+            detections = self.memory_cache.get((output_fp, None))
+            if detections is None:
+                detections = self.load_cache(output_fp)
+                if (detections is None and self.hasher == 'sha1' and not self.get_settings_tag()
+                        and selection is None and self.is_path(pdf_fp)):
+                    detections = self.migrate_legacy_cache(pdf_fp, hash_value, output_fp)
+                if detections is not None:
+                    self.memory_cache.put((output_fp, None), detections)
+        self.metrics.count('cache_misses' if detections is None else 'cache_hits')
+        return detections
+    
+    def invoke(self, pdf_fp, proximity_in_pixels=20, report=False, pages=None, regions=None):
         """
             Process a PDF file and group text entries by proximity.
         
             This function generates a unique output filename based on the 
             hash of the PDF file. If the output file already exists, it 
             loads the entries from the existing file; otherwise, it scans 
-            the PDF and creates a new JSON file. The entries are then 
+            the PDF and creates a new binary cache file. The entries are then 
             grouped by proximity and filtered to keep only the text.
         
             Args:
-                pdf_fp (str): The file path to the PDF file to be processed.
+                pdf_fp (str, bytes or file object): The file path to the PDF
+                    file to be processed, or its contents as bytes, a bytearray,
+                    a memoryview or a binary file object. The contents share
+                    the cache of the file they came from.
                 proximity_in_pixels (int, optional): The proximity threshold 
                     for grouping text entries. Defaults to 20.
+                report (bool, optional): Return an InvokeResult whose report
+                    attribute holds the timings and counters of this call.
+                    Defaults to False.
+                pages (iterable, optional): Only process these pages, numbered
+                    from 1. Defaults to every page.
+                regions (list or dict, optional): Only OCR these (x0, y0, x1, y1)
+                    boxes, in pixels at dpi. A list applies to every page, a dict
+                    maps page numbers to their own boxes. See get_selection.
         
             Returns:
                 list: A list of text entries grouped by proximity.
             """    
-        #Add hash to filename to ensure it is unique
+        selection = self.get_selection(pages, regions)
+        if not (report or self.metrics.enabled):
+            return self.run_invoke(pdf_fp, proximity_in_pixels, selection)
+        call = self.metrics.begin_call()
+        try:
+            result = self.run_invoke(pdf_fp, proximity_in_pixels, selection)
+        finally:
+            call_report = self.metrics.end_call(call)
+        if report:
+            result = InvokeResult(result)
+            result.report = call_report
+        return result
+    
+    def run_invoke(self, pdf_fp, proximity_in_pixels, selection=None):
+        """
+        Do the work of invoke.
+    
+        Args:
+            pdf_fp (str, bytes or file object): The PDF file to be processed, see invoke.
+            proximity_in_pixels (int): The proximity threshold for grouping text entries.
+            selection (tuple, optional): The pages and regions to process, see get_selection.
+    
+        Returns:
+            list: A list of text entries grouped by proximity.
+        """
+        # a file object is read once, then hashed and rendered from the same buffer
+        pdf_fp = self.read_document(pdf_fp)
+        #Name the cache file after the contents of the pdf so copies of the same file share it
         hash_value = self.get_hash(pdf_fp)
-        #Output to data/output as specified in eut_filepaths.
-        #This will reduce processing time drastically if the same file is processed more than once
-        output_fp = os.path.join(self.output_dir, os.path.split(hash_value+os.path.splitext(pdf_fp)[0]+'.txt')[-1])
-        if not os.path.exists(output_fp):
-            #Scan the pdf and create a json file with location of text and actual text
-            entries = self.pdf_to_json(pdf_fp, output_fp)
+        # group entries by proximity and keep only their text, unless that was done before
+        return self.get_groups(pdf_fp, hash_value, proximity_in_pixels, selection=selection)
+    
+    def get_groups_path(self, hash_value, proximity_in_pixels, selection=None):
+        """
+        Return the path of the file holding the grouped result of a document at a proximity.
+    
+        Args:
+            hash_value (str): The digest of the document.
+            proximity_in_pixels (int): The proximity threshold the result was grouped with.
+            selection (tuple, optional): The pages and regions grouped, see get_selection.
+    
+        Returns:
+            str: The path, next to the OCR cache file of the document.
+        """
+        return os.path.splitext(self.get_cache_path(hash_value, selection))[0] + f'.groups-{proximity_in_pixels}.json'
+    
+    def get_groups(self, pdf_fp, hash_value, proximity_in_pixels, detections=None, selection=None):
+        """
+        Return the text groups of a document, from the fastest place that has them.
+    
+        The memory cache is tried first, then the grouped result saved on disk, then the
+        document's detections are grouped, loading them from the cache or scanning the
+        document if needed. New results are saved to the tiers that missed.
+    
+        Args:
+            pdf_fp (str): The file path to the PDF file.
+            hash_value (str): The digest of the PDF file.
+            proximity_in_pixels (int): The proximity threshold for grouping text entries.
+            detections (Detections, optional): The detections of the document, if the caller
+                already has them.
+            selection (tuple, optional): The pages and regions to process, see get_selection.
+    
+        Returns:
+            list: A list of text entries grouped by proximity. The lists are the caller's own
+                  and can be changed without affecting the cache.
+        """
+        key = (self.get_cache_path(hash_value, selection), proximity_in_pixels)
+        groups = self.memory_cache.get(key)
+        if groups is not None:
+            self.metrics.count('memory_cache_hits')
         else:
-            with open(output_fp, 'r') as f:
-                try:                
-                    entries = json.load(f)
-                except:
-                    entries = self.pdf_to_json(pdf_fp, output_fp)
-        # group entries by proximity
-        result =  self.process_entries(entries, proximity_in_pixels)
-        #Filter result to only keep text, remove coordinates
-        result = [list(map(lambda x: x[4], entry)) for entry in result]
-        return result
+            groups_fp = self.get_groups_path(hash_value, proximity_in_pixels, selection)
+            groups = self.load_groups(groups_fp) if self.cache_groups else None
+            if groups is not None:
+                self.metrics.count('group_cache_hits')
+            else:
+                if detections is None:
+                    #This will reduce processing time drastically if the same file is processed more than once
+                    detections = self.get_cached_detections(pdf_fp, hash_value, selection)
+                if detections is None:
+                    #Scan the pdf and create a cache file with location of text and actual text, once
+                    #across every process sharing the cache
+                    detections = self.scan_and_store(pdf_fp, hash_value, selection)
+                groups = self.group_texts(detections, proximity_in_pixels)
+                if self.cache_groups:
+                    with self.metrics.stage('cache_write'):
+                        with self.atomic_write(groups_fp, 'w') as f:
+                            json.dump(groups, f)
+                        self.cache_index.record_write(groups_fp)
+            self.memory_cache.put(key, groups)
+        return [list(group) for group in groups]
+    
+    def load_groups(self, groups_fp):
+        """
+        Load a grouped result saved by get_groups.
+    
+        Args:
+            groups_fp (str): The file path of the grouped result.
+    
+        Returns:
+            list: The text groups, or None if there is no usable file.
+        """
+        try:
+            with open(groups_fp, 'r') as f:
+                groups = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.cache_index.record_access(groups_fp)
+        return groups
+    
+    def iter_groups(self, pdf_fp, proximity_in_pixels=20):
+        """
+        Process a PDF file page by page, yielding the text groups of each page as soon as the
+        page has been OCRed.
+    
+        Unlike invoke, boxes are only grouped with boxes on the same page, and no group is
+        dropped. Only one rendered page batch is held in memory at a time. A cached document
+        is split back into its pages, otherwise the document is scanned and saved to the cache
+        once the last page is done, so a later invoke of the same file is a cache hit. Pages
+        already in the page cache aren't OCRed again, so an iteration that is stopped early
+        resumes where it left off. The cache lock is only held to save the result, never while
+        the caller has a page, so a slow consumer doesn't hold up other callers; processes
+        scanning the same document at once share its pages through the page cache instead.
+    
+        Args:
+            pdf_fp (str, bytes or file object): The PDF file to be processed, see invoke.
+            proximity_in_pixels (int, optional): The proximity threshold 
+                for grouping text entries. Defaults to 20.
+    
+        Yields:
+            tuple: The page number, starting at 1, and the non-empty text groups of the page.
+        """
+        def page_groups(page):
+            return [group for group in self.group_texts(page, proximity_in_pixels, complete=True) if group]
+    
+        pdf_fp = self.read_document(pdf_fp)
+        hash_value = self.get_hash(pdf_fp)
+        detections = self.get_cached_detections(pdf_fp, hash_value)
+        # cache files written before page boundaries were recorded are scanned again
+        if detections is None or detections.page_offsets is None:
+            with self.spooled_document(pdf_fp) as pdf_path:
+                text_pages = self.get_text_layer(pdf_path) if self.text_layer else {}
+                pages = []
+                for page_number, page in enumerate(self.iter_page_detections(pdf_path, text_pages), 1):
+                    pages.append(page)
+                    yield page_number, page_groups(page)
+            output_fp = self.get_cache_path(hash_value)
+            with self.get_cache_lock(output_fp):
+                # another caller may have saved the document while this one was iterating
+                detections = self.load_cache(output_fp)
+                if detections is None or detections.page_offsets is None:
+                    with self.metrics.stage('cache_write'):
+                        self.write_cache(Detections.concatenate(pages), output_fp)
+                        self.cache_index.record_write(output_fp)
+            return
+        for page_number, page in enumerate(detections.split_pages(), 1):
+            yield page_number, page_groups(page)
+    
+    def find_pdfs(self, paths):
+        """
+        Expand directories into the PDF files they contain.
+    
+        Args:
+            paths (str or iterable): A PDF file, a directory, or an iterable of either.
+                Directories are searched recursively for files ending in .pdf.
+    
+        Returns:
+            list: The PDF file paths, directory contents in sorted order.
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        pdf_fps = []
+        for path in paths:
+            if not os.path.isdir(path):
+                pdf_fps.append(path)
+                continue
+            for root, dirs, filenames in os.walk(path):
+                dirs.sort()
+                pdf_fps.extend(os.path.join(root, filename) for filename in sorted(filenames)
+                               if filename.lower().endswith('.pdf'))
+        return pdf_fps
+    
+    def invoke_many(self, paths, proximity_in_pixels=20, return_exceptions=False):
+        """
+        Process many PDF files, yielding each result as soon as it is ready.
+    
+        The files are hashed first and files with the same contents are only processed
+        once. Cached documents are yielded straight away. The rest are scanned largest file
+        first, spread over the worker processes when workers is greater than 1, so the
+        longest scans don't hold up the end of the batch. A throughput summary is logged
+        when the batch is done and kept in batch_summary.
+    
+        Args:
+            paths (str or iterable): A PDF file, a directory, or an iterable of either.
+                Directories are searched recursively for files ending in .pdf.
+            proximity_in_pixels (int, optional): The proximity threshold 
+                for grouping text entries. Defaults to 20.
+            return_exceptions (bool, optional): Yield the exception raised while reading or
+                scanning a file as its result instead of raising it. Defaults to False.
+    
+        Yields:
+            tuple: The file path and its result, the same list of text entries grouped by
+                   proximity that invoke returns. Every input path is yielded, duplicates
+                   included.
+        """
+        start = time.perf_counter()
+        summary = {'documents': 0, 'unique_documents': 0, 'cache_hits': 0, 'pages': 0, 'failures': 0}
+        self.batch_summary = summary
+        duplicates = {}
+        for pdf_fp in self.find_pdfs(paths):
+            summary['documents'] += 1
+            try:
+                hash_value = self.get_hash(pdf_fp)
+            except OSError as e:
+                if not return_exceptions:
+                    raise
+                summary['failures'] += 1
+                yield pdf_fp, e
+                continue
+            duplicates.setdefault(hash_value, []).append(pdf_fp)
+        summary['unique_documents'] = len(duplicates)
+    
+        pending = []
+        for hash_value, pdf_fps in duplicates.items():
+            detections = self.get_cached_detections(pdf_fps[0], hash_value)
+            if detections is None:
+                pending.append((os.path.getsize(pdf_fps[0]), hash_value))
+                continue
+            summary['cache_hits'] += 1
+            result = self.get_groups(pdf_fps[0], hash_value, proximity_in_pixels, detections)
+            for pdf_fp in pdf_fps:
+                yield pdf_fp, result
+        # largest first so the longest scans start early instead of finishing last
+        pending.sort(reverse=True)
+    
+        if self.workers > 1:
+            futures = {self.get_executor().submit(_scan_document_worker, duplicates[hash_value][0], hash_value): hash_value
+                       for _, hash_value in pending}
+            scans = ((futures[future], future) for future in as_completed(futures))
+        else:
+            scans = ((hash_value, None) for _, hash_value in pending)
+        for hash_value, future in scans:
+            pdf_fps = duplicates[hash_value]
+            try:
+                if future is None:
+                    detections, page_count = self.scan_and_store(pdf_fps[0], hash_value), self.get_page_count(pdf_fps[0])
+                else:
+                    detections, page_count = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                summary['failures'] += 1
+                for pdf_fp in pdf_fps:
+                    yield pdf_fp, e
+                continue
+            summary['pages'] += page_count
+            result = self.get_groups(pdf_fps[0], hash_value, proximity_in_pixels, detections)
+            for pdf_fp in pdf_fps:
+                yield pdf_fp, result
+    
+        elapsed = time.perf_counter() - start
+        summary['seconds'] = elapsed
+        summary['documents_per_second'] = summary['documents'] / elapsed if elapsed else 0.0
+        summary['pages_per_second'] = summary['pages'] / elapsed if elapsed else 0.0
+        summary['cache_hit_ratio'] = summary['cache_hits'] / summary['unique_documents'] if duplicates else 0.0
+        logger.info('Processed %(documents)d documents (%(unique_documents)d unique, %(cache_hits)d cached, '
+                    '%(failures)d failed) in %(seconds).1fs: %(documents_per_second).2f documents/s, '
+                    '%(pages_per_second).2f pages/s, cache hit ratio %(cache_hit_ratio).2f', summary)
+
+    
+    def get_async_executors(self):
+        """
+        Return the executors ainvoke runs blocking work on, starting them if needed.
+    
+        Hashing, cache reads and grouping run on a thread pool sized to max_concurrency. Scans,
+        and the cache writes that follow them, run on the worker process pool when workers is
+        greater than 1, otherwise on a single thread, as only one thread at a time can use the
+        shared reader.
+    
+        Returns:
+            tuple: The I/O executor and the OCR executor.
+        """
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                   thread_name_prefix='easyocr-unstructured-io')
+        if self._ocr_executor is None and self.workers <= 1:
+            self._ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='easyocr-unstructured-ocr')
+        return self._io_executor, self.get_executor() if self.workers > 1 else self._ocr_executor
+    
+    def get_async_state(self):
+        """
+        Return the concurrency limit and in-flight scans of ainvoke for the running event loop.
+    
+        Returns:
+            tuple: An asyncio.Semaphore and a dict of scan tasks keyed by document hash.
+        """
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            state = self._async_state[loop] = (asyncio.Semaphore(self.max_concurrency), {})
+        return state
+    
+    async def ainvoke(self, pdf_fp, proximity_in_pixels=20):
+        """
+        Process a PDF file like invoke without blocking the event loop.
+    
+        Hashing, cache access and grouping run on a thread pool and OCR on the OCR executor.
+        At most max_concurrency documents are scanned at once, further requests wait for a
+        slot. Concurrent requests for the same document share one scan.
+    
+        Args:
+            pdf_fp (str, bytes or file object): The PDF file to be processed, see invoke.
+            proximity_in_pixels (int, optional): The proximity threshold 
+                for grouping text entries. Defaults to 20.
+    
+        Returns:
+            list: A list of text entries grouped by proximity.
+        """
+        loop = asyncio.get_running_loop()
+        io_executor, _ = self.get_async_executors()
+        if hasattr(pdf_fp, 'read'):
+            pdf_fp = await loop.run_in_executor(io_executor, self.read_document, pdf_fp)
+        else:
+            pdf_fp = self.read_document(pdf_fp)
+        hash_value = await loop.run_in_executor(io_executor, self.get_hash, pdf_fp)
+        _, in_flight = self.get_async_state()
+        scan = in_flight.get(hash_value)
+        if scan is None:
+            scan = in_flight[hash_value] = asyncio.ensure_future(self.aget_detections(pdf_fp, hash_value))
+            scan.add_done_callback(lambda _: in_flight.pop(hash_value, None))
+        # a cancelled caller must not cancel the scan other callers are waiting on
+        detections = await asyncio.shield(scan)
+        return await loop.run_in_executor(io_executor, self.get_groups, pdf_fp, hash_value, proximity_in_pixels,
+                                          detections)
+    
+    async def aget_detections(self, pdf_fp, hash_value):
+        """
+        Load the detections of a document from the cache, scanning it on a miss.
+    
+        Args:
+            pdf_fp (str): The file path to the PDF file.
+            hash_value (str): The digest of the PDF file.
+    
+        Returns:
+            Detections: The detections of the document.
+        """
+        loop = asyncio.get_running_loop()
+        io_executor, ocr_executor = self.get_async_executors()
+        detections = await loop.run_in_executor(io_executor, self.get_cached_detections, pdf_fp, hash_value)
+        if detections is not None:
+            return detections
+        semaphore, _ = self.get_async_state()
+        async with semaphore:
+            if self.workers > 1:
+                # the worker process reads a document held in memory from a file, rather than
+                # being sent its contents
+                with self.spooled_document(pdf_fp) as pdf_path:
+                    detections, _ = await loop.run_in_executor(ocr_executor, _scan_document_worker, pdf_path,
+                                                               hash_value)
+            else:
+                detections = await loop.run_in_executor(ocr_executor, self.scan_and_store, pdf_fp, hash_value)
+        return detections
+    
+    async def ainvoke_many(self, paths, proximity_in_pixels=20, return_exceptions=False):
+        """
+        Process many PDF files like invoke_many without blocking the event loop.
+    
+        At most four times max_concurrency files are in progress at once, so a long
+        iterable of paths is consumed as results are taken rather than all at once.
+    
+        Args:
+            paths (str or iterable): A PDF file, a directory, or an iterable of either.
+                Directories are searched recursively for files ending in .pdf.
+            proximity_in_pixels (int, optional): The proximity threshold 
+                for grouping text entries. Defaults to 20.
+            return_exceptions (bool, optional): Yield the exception raised while processing a
+                file as its result instead of raising it. Defaults to False.
+    
+        Yields:
+            tuple: The file path and its result, in the order the files finish.
+        """
+        async def process(pdf_fp):
+            try:
+                return pdf_fp, await self.ainvoke(pdf_fp, proximity_in_pixels)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return pdf_fp, e
+    
+        pdf_fps = iter(self.find_pdfs(paths))
+        pending = set()
+        try:
+            while True:
+                for pdf_fp in pdf_fps:
+                    pending.add(asyncio.ensure_future(process(pdf_fp)))
+                    if len(pending) >= self.max_concurrency * 4:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+# EasyocrUnstructured object used by a page OCR worker process, created once per process
+_worker = None
+
+
+def _init_page_worker(options, torch_threads):
+    """
+    Initialise a page OCR worker process.
+    
+    Args:
+        options (dict): Keyword arguments for the worker's EasyocrUnstructured object.
+        torch_threads (int): The number of torch intra-op threads the worker may use.
+    
+    Returns:
+        None
+    """
+    global _worker
+    import torch
+    torch.set_num_threads(torch_threads)
+    _worker = EasyocrUnstructured(**options)
+    _worker.warm_up()
+
+
+def _ocr_page_worker(pdf_path, page_number):
+    """
+    Rasterize and OCR one page of a PDF file in a worker process.
+    
+    Args:
+        pdf_path (str): The path to the PDF file.
+        page_number (int): The page to OCR, starting at 1.
+    
+    Returns:
+        Detections: The detections found on the page.
+    """
+    image = _worker.render_pages(pdf_path, first_page=page_number, last_page=page_number)[0]
+    return _worker.ocr_rendered_page(pdf_path, page_number, image)
+
+
+def _scan_document_worker(pdf_path, hash_value):
+    """
+    Scan a whole PDF file in a worker process and save it to the cache.
+    
+    Args:
+        pdf_path (str): The path to the PDF file.
+        hash_value (str): The digest of the PDF file.
+    
+    Returns:
+        tuple: The detections of the document and its page count.
+    """
+    return _worker.scan_and_store(pdf_path, hash_value), _worker.get_page_count(pdf_path)
+
+
+def expand_inputs(inputs):
+    """
+    Expand the glob patterns among command line inputs.
+    
+    Args:
+        inputs (list): PDF files, directories or glob patterns. A pattern matching nothing is
+            kept as it is, so it is reported as a missing file.
+    
+    Returns:
+        list: The files and directories, matches of each pattern in sorted order.
+    """
+    paths = []
+    for path in inputs:
+        matches = sorted(glob.glob(path, recursive=True)) if glob.has_magic(path) else []
+        paths.extend(matches or [path])
+    return paths
+
+
+def read_manifest(manifest_fp):
+    """
+    Read the files a previous run finished from its manifest.
+    
+    Args:
+        manifest_fp (str): The manifest file path, one finished PDF path per line.
+    
+    Returns:
+        set: The finished paths, empty if the manifest doesn't exist.
+    """
+    if not manifest_fp or not os.path.exists(manifest_fp):
+        return set()
+    with open(manifest_fp, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.endswith('\n')}
+
+
+def main(argv=None):
+    """
+    Process PDF files from the command line, writing one JSON line per file.
+    
+    Each output line holds the path of a file and its text groups, or the error it failed
+    with. With --manifest, the path of every file written successfully is appended to the
+    manifest, and a rerun with the same manifest skips those files and appends to the
+    output instead of replacing it. A throughput report is printed to stderr at the end.
+    
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv[1:].
+    
+    Returns:
+        int: The exit status, 1 if any file failed.
+    """
+    parser = argparse.ArgumentParser(prog='easyocr-unstructured',
+                                     description='Parse unstructured text from PDFs with EasyOCR.')
+    parser.add_argument('inputs', nargs='+', help='PDF files, directories or glob patterns')
+    parser.add_argument('-o', '--output', default='-', help='JSONL output file, - for stdout (default)')
+    parser.add_argument('--manifest', help='file recording finished inputs, to resume an interrupted run')
+    parser.add_argument('--workers', type=int, default=1, help='OCR worker processes (default 1)')
+    parser.add_argument('--dpi', type=int, default=200, help='render resolution (default 200)')
+    parser.add_argument('--proximity', type=int, default=20,
+                        help='grouping distance in pixels at the render resolution (default 20)')
+    parser.add_argument('--lang', nargs='+', default=['en'], help='easyocr language codes (default en)')
+    parser.add_argument('--cpu', action='store_true', help='run the OCR models on the CPU')
+    parser.add_argument('--cache-dir', help='cache directory (default tmp/easyocr_unstructured)')
+    parser.add_argument('--profile', default='default', choices=sorted(EasyocrUnstructured.INFERENCE_PROFILES),
+                        help='how the OCR models are run (default default)')
+    args = parser.parse_args(argv)
+
+    eu = EasyocrUnstructured(lang_list=args.lang, gpu=not args.cpu, workers=args.workers, dpi=args.dpi,
+                             cache_dir=args.cache_dir, inference_profile=args.profile)
+    done = read_manifest(args.manifest)
+    # a file named by more than one input is only processed once
+    pdf_fps = [pdf_fp for pdf_fp in dict.fromkeys(eu.find_pdfs(expand_inputs(args.inputs))) if pdf_fp not in done]
+    if done:
+        print(f'Resuming: skipping {len(done)} finished files', file=sys.stderr)
+    output = sys.stdout if args.output == '-' else open(args.output, 'a' if done else 'w', encoding='utf-8')
+    manifest = open(args.manifest, 'a', encoding='utf-8') if args.manifest else None
+    try:
+        for pdf_fp, result in eu.invoke_many(pdf_fps, args.proximity, return_exceptions=True):
+            if isinstance(result, Exception):
+                record = {'path': pdf_fp, 'error': f'{type(result).__name__}: {result}'}
+            else:
+                record = {'path': pdf_fp, 'groups': result}
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+            if manifest is not None and 'groups' in record:
+                manifest.write(pdf_fp + '\n')
+                manifest.flush()
+    finally:
+        eu.close()
+        if output is not sys.stdout:
+            output.close()
+        if manifest is not None:
+            manifest.close()
+    summary = eu.batch_summary
+    if summary and 'seconds' in summary:
+        print('{documents} documents ({unique_documents} unique, {cache_hits} cached, {failures} failed), '
+              '{pages} pages in {seconds:.1f}s: {documents_per_second:.2f} documents/s, '
+              '{pages_per_second:.2f} pages/s'.format(**summary), file=sys.stderr)
+    return 1 if summary and summary['failures'] else 0
 
 
 if __name__ == '__main__':
-    import sys
-    sys.exit(0)
+    sys.exit(main())
@@ -11,6 +11,11 @@ setup(
     long_description_content_type='text/markdown',
     url='https://github.com/shorecodeorg/easyocr-unstructured',  # Replace with your project URL
     py_modules=['easyocr_unstructured'],
+    entry_points={
+        'console_scripts': [
+            'easyocr-unstructured=easyocr_unstructured:main',
+        ],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',  # Change if using a different license
@@ -21,5 +26,6 @@ setup(
         'numpy',        # For numerical operations
         'easyocr',      # For Optical Character Recognition
         'pdf2image',    # For converting PDFs to images
+        'filelock',     # For locking cache entries across processes
     ],    
 )
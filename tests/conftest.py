@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Import the module the same way it is installed by setup.py. It is imported here, before
+# pytest puts the repository root, which holds a package of the same name, first on sys.path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'easyocr_unstructured'))
+import easyocr_unstructured  # noqa: E402,F401
+
+# the synthetic OCR layouts are shared with the benchmarks
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
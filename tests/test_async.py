@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def make_pdf(tmp_path, name):
+    pdf_fp = str(tmp_path / name)
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 ' + name.encode())
+    return pdf_fp
+
+
+def stub_scans(eu, monkeypatch, ocr_images):
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: 1)
+    monkeypatch.setattr(eu, 'render_pages', lambda pdf_path, first_page=None, last_page=None, dpi=None:
+                        [Image.new('RGB', (10, 10))])
+    monkeypatch.setattr(eu, 'ocr_images', ocr_images)
+
+
+def page_detections(images):
+    return [Detections.from_readtext([([[0, 0], [10, 0], [10, 10], [0, 10]], 'one', 0.9),
+                                      ([[0, 100], [10, 100], [10, 110], [0, 110]], 'two', 0.9)])
+            for _ in images]
+
+
+async def wait_for(event):
+    while not event.is_set():
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def blocked_scan(tmp_path, monkeypatch):
+    """An EasyocrUnstructured whose scans wait for the returned release event."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def ocr_images(images):
+        calls.append('ocr')
+        started.set()
+        release.wait(10)
+        return page_detections(images)
+
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'))
+    stub_scans(eu, monkeypatch, ocr_images)
+    aget_detections = eu.aget_detections
+
+    def counted(pdf_fp, hash_value):
+        calls.append('scan')
+        return aget_detections(pdf_fp, hash_value)
+    monkeypatch.setattr(eu, 'aget_detections', counted)
+    yield eu, started, release, calls
+    release.set()
+    eu.close()
+
+
+def test_concurrent_calls_share_one_scan(tmp_path, blocked_scan):
+    eu, started, release, calls = blocked_scan
+    pdf_fp = make_pdf(tmp_path, 'doc.pdf')
+
+    async def run():
+        first = asyncio.ensure_future(eu.ainvoke(pdf_fp))
+        await wait_for(started)
+        second = asyncio.ensure_future(eu.ainvoke(pdf_fp))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(run())
+    assert first == second == eu.invoke(pdf_fp)
+    assert calls == ['scan', 'ocr']
+
+
+def test_cancelled_caller_leaves_the_shared_scan_running(tmp_path, blocked_scan):
+    eu, started, release, calls = blocked_scan
+    pdf_fp = make_pdf(tmp_path, 'doc.pdf')
+
+    async def run():
+        first = asyncio.ensure_future(eu.ainvoke(pdf_fp))
+        await wait_for(started)
+        second = asyncio.ensure_future(eu.ainvoke(pdf_fp))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        return await second
+
+    assert asyncio.run(run()) == eu.invoke(pdf_fp)
+    assert calls == ['scan', 'ocr']
+
+
+def test_scans_are_limited_to_max_concurrency(tmp_path, monkeypatch):
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def ocr_images(images):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return page_detections(images)
+
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'), page_cache=False, max_concurrency=2)
+    stub_scans(eu, monkeypatch, ocr_images)
+    # give the OCR executor more threads than the limit, so only the limit holds scans back
+    eu._ocr_executor = ThreadPoolExecutor(max_workers=4)
+    pdf_fps = [make_pdf(tmp_path, f'doc{i}.pdf') for i in range(4)]
+
+    async def run():
+        return await asyncio.gather(*[eu.ainvoke(pdf_fp) for pdf_fp in pdf_fps])
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        eu.close()
+    assert len(results) == 4
+    assert peak[0] == 2
+
+
+def test_ainvoke_many_returns_exceptions(tmp_path, monkeypatch):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'))
+    stub_scans(eu, monkeypatch, page_detections)
+    pdf_fps = [make_pdf(tmp_path, f'doc{i}.pdf') for i in range(3)]
+    missing_fp = str(tmp_path / 'missing.pdf')
+
+    async def run():
+        return {pdf_fp: result async for pdf_fp, result in
+                eu.ainvoke_many(pdf_fps + [missing_fp], return_exceptions=True)}
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        eu.close()
+    assert isinstance(results.pop(missing_fp), FileNotFoundError)
+    assert results == {pdf_fp: eu.invoke(pdf_fp) for pdf_fp in pdf_fps}
@@ -0,0 +1,140 @@
+import glob
+import os
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def test_lock_files_are_removed(tmp_path, monkeypatch):
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 document')
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'))
+    monkeypatch.setattr(eu, 'scan_detections', lambda pdf_path, selection=None: Detections())
+    eu.invoke(pdf_fp)
+    eu.invoke(pdf_fp, pages=[1])
+    assert glob.glob(str(tmp_path / 'cache' / '**' / '*.lock'), recursive=True) == []
+
+
+def test_legacy_migration_stays_in_the_cache_dir(tmp_path):
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 document')
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'))
+    hash_value = eu.get_hash(pdf_fp)
+    # a file named like a legacy cache file, one directory above the cache root
+    outside_fp = str(tmp_path / (hash_value + 'doc' + eu.CACHE_EXTENSION))
+    eu.write_cache(Detections(), outside_fp)
+    assert eu.get_cached_detections('doc.pdf', hash_value) is None
+    assert os.path.exists(outside_fp)
+
+
+def test_index_total_size_follows_the_entries(tmp_path):
+    from easyocr_unstructured import CacheIndex
+
+    def write(name, size):
+        path = str(tmp_path / name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        index.record_write(path)
+        return path
+
+    index = CacheIndex(str(tmp_path), max_bytes=1000)
+    paths = [write(f'file{i}', 300) for i in range(3)]
+    write('file0', 100)
+    index.remove(paths[1])
+    write('file3', 700)
+    connection = index.get_connection()
+    assert index.total_size() == connection.execute('SELECT SUM(size) FROM entries').fetchone()[0] <= 1000
+
+    # an index written before the total was kept is summed when it is opened
+    connection.execute('DROP TABLE stats')
+    connection.execute('DROP TRIGGER entries_insert')
+    reopened = CacheIndex(str(tmp_path), max_bytes=1000)
+    assert reopened.total_size() == index.total_size()
+
+
+def test_lfu_admits_new_files(tmp_path):
+    from easyocr_unstructured import CacheIndex
+
+    def write(name, size):
+        path = str(tmp_path / name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        index.record_write(path)
+        return path
+
+    index = CacheIndex(str(tmp_path), max_bytes=1000, policy='lfu')
+    paths = [write(f'file{i}', 300) for i in range(3)]
+    for path in paths:
+        index.record_access(path)
+    new_path = write('file3', 300)
+    assert os.path.exists(new_path)
+    assert not os.path.exists(paths[0])
+    assert index.total_size() <= 1000
+
+    # the file being written is never evicted, even when it is the only candidate
+    index.max_bytes = 100
+    big_path = write('file4', 500)
+    assert os.path.exists(big_path)
+
+
+def test_empty_cache_files_are_rescanned(tmp_path, monkeypatch):
+    from PIL import Image
+
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 document')
+    image = Image.new('RGB', (10, 10))
+
+    def stubbed(cache_dir):
+        eu = EasyocrUnstructured(cache_dir=cache_dir)
+        monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: 1)
+        monkeypatch.setattr(eu, 'render_pages', lambda pdf_path, first_page=None, last_page=None, dpi=None: [image])
+        monkeypatch.setattr(eu, 'ocr_images', lambda images: [Detections.from_readtext(
+            [([[0, 0], [10, 0], [10, 10], [0, 10]], 'one', 0.9),
+             ([[0, 100], [10, 100], [10, 110], [0, 110]], 'two', 0.9)]) for _ in images])
+        return eu
+
+    expected = stubbed(str(tmp_path / 'fresh')).invoke(pdf_fp)
+    eu = stubbed(str(tmp_path / 'cache'))
+    # zero-length files, as a crash can leave behind, in place of the document and page caches
+    for path in (eu.get_cache_path(eu.get_hash(pdf_fp)),
+                 eu.get_shard_path(eu.page_dir, eu.get_page_hash(image) + eu.CACHE_EXTENSION)):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'wb').close()
+    assert eu.invoke(pdf_fp) == expected
+    assert expected != [[]]
+
+
+def test_file_digests_are_pruned(tmp_path):
+    from easyocr_unstructured import CacheIndex
+
+    index = CacheIndex(str(tmp_path), max_age_days=7, max_file_digests=3)
+    for i in range(5):
+        index.set_file_digest(f'/uploads/{i}.pdf', 'sha1', 'signature', f'digest{i}')
+    assert [index.get_file_digest(f'/uploads/{i}.pdf', 'sha1', 'signature') for i in range(5)] == [
+        None, None, 'digest2', 'digest3', 'digest4']
+
+    # digests older than max_age_days go with the next eviction
+    index.get_connection().execute("UPDATE file_digests SET hashed_at = 0 WHERE path = '/uploads/2.pdf'")
+    index.evict()
+    assert index.get_file_digest('/uploads/2.pdf', 'sha1', 'signature') is None
+    assert index.get_connection().execute('SELECT COUNT(*) FROM file_digests').fetchone()[0] == 2
+
+
+def test_untimestamped_file_digests_are_migrated(tmp_path):
+    import sqlite3
+
+    from easyocr_unstructured import CacheIndex
+
+    connection = sqlite3.connect(str(tmp_path / CacheIndex.INDEX_FILENAME))
+    connection.execute('CREATE TABLE file_digests (path TEXT NOT NULL, algorithm TEXT NOT NULL, '
+                       'signature TEXT NOT NULL, digest TEXT NOT NULL, PRIMARY KEY (path, algorithm))')
+    connection.execute("INSERT INTO file_digests VALUES ('/old.pdf', 'sha1', 'signature', 'digest')")
+    connection.commit()
+    connection.close()
+    index = CacheIndex(str(tmp_path))
+    assert index.get_file_digest('/old.pdf', 'sha1', 'signature') == 'digest'
+    index.max_file_digests = 1
+    index.set_file_digest('/new.pdf', 'sha1', 'signature', 'digest')
+    assert index.get_file_digest('/old.pdf', 'sha1', 'signature') is None
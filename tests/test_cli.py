@@ -0,0 +1,54 @@
+import json
+import os
+
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured, main
+
+
+def test_rerun_with_manifest_resumes(tmp_path, monkeypatch):
+    input_dir = tmp_path / 'pdfs'
+    input_dir.mkdir()
+    for name in ('a.pdf', 'b.pdf', 'bad.pdf'):
+        with open(input_dir / name, 'wb') as f:
+            f.write(b'%PDF-1.4 ' + name.encode())
+    broken = {'bad.pdf'}
+    scanned = []
+
+    def render_pages(self, pdf_path, first_page=None, last_page=None, dpi=None):
+        scanned.append(os.path.basename(pdf_path))
+        if os.path.basename(pdf_path) in broken:
+            raise ValueError('damaged PDF')
+        return [Image.new('RGB', (10, 10))]
+
+    monkeypatch.setattr(EasyocrUnstructured, 'get_page_count', lambda self, pdf_path: 1)
+    monkeypatch.setattr(EasyocrUnstructured, 'render_pages', render_pages)
+    monkeypatch.setattr(EasyocrUnstructured, 'ocr_images', lambda self, images: [Detections.from_readtext(
+        [([[0, 0], [10, 0], [10, 10], [0, 10]], 'one', 0.9),
+         ([[0, 100], [10, 100], [10, 110], [0, 110]], 'two', 0.9)]) for _ in images])
+    output_fp = str(tmp_path / 'out.jsonl')
+    manifest_fp = str(tmp_path / 'manifest.txt')
+    argv = [str(input_dir), '-o', output_fp, '--manifest', manifest_fp, '--cpu',
+            '--cache-dir', str(tmp_path / 'cache')]
+
+    assert main(argv) == 1
+    with open(output_fp, 'r', encoding='utf-8') as f:
+        first_run = [json.loads(line) for line in f]
+    assert sorted(os.path.basename(record['path']) for record in first_run) == ['a.pdf', 'b.pdf', 'bad.pdf']
+    assert [record['error'] for record in first_run if 'error' in record] == ['ValueError: damaged PDF']
+    with open(manifest_fp, 'r', encoding='utf-8') as f:
+        assert sorted(os.path.basename(line.strip()) for line in f) == ['a.pdf', 'b.pdf']
+
+    broken.clear()
+    scanned.clear()
+    assert main(argv) == 0
+    # only the file that failed is processed again, and its line is added after the first run's
+    assert scanned == ['bad.pdf']
+    with open(output_fp, 'r', encoding='utf-8') as f:
+        second_run = [json.loads(line) for line in f]
+    assert second_run[:3] == first_run
+    assert len(second_run) == 4
+    assert os.path.basename(second_run[3]['path']) == 'bad.pdf'
+    assert 'groups' in second_run[3]
+    with open(manifest_fp, 'r', encoding='utf-8') as f:
+        assert sorted(os.path.basename(line.strip()) for line in f) == ['a.pdf', 'b.pdf', 'bad.pdf']
@@ -0,0 +1,42 @@
+"""process_entries against the original recursive grouping it replaced."""
+import copy
+
+import pytest
+
+from easyocr_unstructured import EasyocrUnstructured
+from layouts import LAYOUTS
+
+PROXIMITIES = [0, 5, 20, 60, 200]
+
+
+def reference_process_entries(eu, entries, proximity_in_pixels):
+    """The original recursive grouping, kept as the golden reference for process_entries."""
+    entries.sort(key=lambda x: (x[0][1], x[0][0]))
+    grouped_results, entries_processed = eu.group_entries(entries, proximity_in_pixels)
+    for entry in entries_processed:
+        entries.remove(entry)
+    if len(entries) > 0:
+        grouped_results.extend(reference_process_entries(eu, entries, proximity_in_pixels))
+    if len(grouped_results) == 0:
+        grouped_results.append(list())
+    return grouped_results
+
+
+@pytest.fixture(scope='module')
+def eu():
+    # grouping doesn't touch the cache, so skip creating the cache directory
+    return EasyocrUnstructured.__new__(EasyocrUnstructured)
+
+
+@pytest.mark.parametrize('proximity', PROXIMITIES)
+@pytest.mark.parametrize('count', [0, 1, 2, 5, 40, 400])
+@pytest.mark.parametrize('layout', sorted(LAYOUTS))
+@pytest.mark.parametrize('repeated_text', [False, True])
+def test_matches_reference(eu, layout, count, proximity, repeated_text):
+    for seed in range(5):
+        entries = LAYOUTS[layout](count, seed=seed)
+        if repeated_text:
+            for entry in entries:
+                entry[4] = 'same'
+        expected = reference_process_entries(eu, copy.deepcopy(entries), proximity)
+        assert eu.process_entries(entries, proximity) == expected
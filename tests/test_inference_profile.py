@@ -0,0 +1,42 @@
+import pytest
+from PIL import Image
+
+from easyocr_unstructured import EasyocrUnstructured
+
+
+def test_unknown_profiles_and_settings_are_rejected():
+    with pytest.raises(ValueError, match='Unknown inference profile'):
+        EasyocrUnstructured.get_inference_profile('fast')
+    with pytest.raises(ValueError, match='Unknown inference settings'):
+        EasyocrUnstructured.get_inference_profile({'threads': 2, 'half': True})
+
+
+def test_profiles_fill_in_the_default_settings():
+    assert EasyocrUnstructured.get_inference_profile() == EasyocrUnstructured.INFERENCE_PROFILES['default']
+    profile = EasyocrUnstructured.get_inference_profile({'threads': 2})
+    assert profile == dict(EasyocrUnstructured.INFERENCE_PROFILES['default'], threads=2)
+    # the class's profiles aren't changed through the returned settings
+    EasyocrUnstructured.get_inference_profile('cpu')['threads'] = 3
+    assert EasyocrUnstructured.INFERENCE_PROFILES['cpu']['threads'] is None
+
+
+def test_reader_key():
+    get_profile = EasyocrUnstructured.get_inference_profile
+    assert EasyocrUnstructured.get_reader_key(['en'], False) == (('en',), 'cpu')
+    assert EasyocrUnstructured.get_reader_key(['en'], 'cuda:1', get_profile()) == (('en',), 'cuda:1')
+    # thread settings don't change the models, so readers are shared across them
+    assert EasyocrUnstructured.get_reader_key(['en'], True, get_profile({'threads': 2})) == (('en',), 'cuda')
+    keys = {EasyocrUnstructured.get_reader_key(['en'], False, get_profile(name))
+            for name in ('default', 'fp32', 'cpu')}
+    assert len(keys) == 3
+
+
+def test_unquantized_results_are_cached_separately(tmp_path):
+    default = EasyocrUnstructured(cache_dir=str(tmp_path))
+    fp32 = EasyocrUnstructured(cache_dir=str(tmp_path), inference_profile='fp32')
+    cpu = EasyocrUnstructured(cache_dir=str(tmp_path), inference_profile='cpu')
+    assert default.get_settings_tag() == cpu.get_settings_tag() == ''
+    assert fp32.get_settings_tag() != ''
+    assert default.get_cache_path('0' * 40) == cpu.get_cache_path('0' * 40) != fp32.get_cache_path('0' * 40)
+    image = Image.new('RGB', (10, 10))
+    assert default.get_page_hash(image) == cpu.get_page_hash(image) != fp32.get_page_hash(image)
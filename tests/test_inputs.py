@@ -0,0 +1,30 @@
+import io
+import os
+
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def test_bytes_are_spooled_once_per_scan(tmp_path, monkeypatch):
+    data = b'%PDF-1.4 in memory document'
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'), page_chunk_size=1)
+    paths = []
+
+    def render_pages(pdf_path, first_page=None, last_page=None, dpi=None):
+        with open(pdf_path, 'rb') as f:
+            assert f.read() == data
+        paths.append(pdf_path)
+        return [Image.new('RGB', (10, 10)) for _ in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: paths.append(pdf_path) or 3)
+    monkeypatch.setattr(eu, 'render_pages', render_pages)
+    monkeypatch.setattr(eu, 'ocr_images', lambda images: [Detections() for _ in images])
+    eu.invoke(io.BytesIO(data))
+    # one page count and three chunks, all read from the same file, which is gone afterwards
+    assert len(paths) == 4 and len(set(paths)) == 1
+    assert not os.path.exists(paths[0])
+
+    pdf_fp = tmp_path / 'doc.pdf'
+    pdf_fp.write_bytes(data)
+    assert eu.get_hash(str(pdf_fp)) == eu.get_hash(data) == eu.get_hash(memoryview(data))
@@ -0,0 +1,31 @@
+import os
+
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def test_invoke_while_iterating(tmp_path, monkeypatch):
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 three pages')
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'), page_chunk_size=1)
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: 3)
+    monkeypatch.setattr(eu, 'render_pages', lambda pdf_path, first_page=None, last_page=None, dpi=None:
+                        [Image.new('RGB', (10, 10)) for _ in range(first_page, last_page + 1)])
+    monkeypatch.setattr(eu, 'ocr_images', lambda images: [
+        Detections.from_readtext([([[0, 0], [10, 0], [10, 10], [0, 10]], 'word', 0.9)]) for _ in images])
+    expected = eu.invoke(pdf_fp)
+    # keep only the page cache, so iter_groups scans the document
+    hash_value = eu.get_hash(pdf_fp)
+    eu.memory_cache.clear()
+    os.remove(eu.get_cache_path(hash_value))
+    os.remove(eu.get_groups_path(hash_value, 20))
+
+    pages = []
+    for page_number, groups in eu.iter_groups(pdf_fp):
+        # the document's cache lock isn't held while the caller has a page
+        assert eu.invoke(pdf_fp) == expected
+        pages.append((page_number, groups))
+    assert pages == [(1, [['word']]), (2, [['word']]), (3, [['word']])]
+    assert eu.load_cache(eu.get_cache_path(hash_value)).page_offsets is not None
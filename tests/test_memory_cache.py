@@ -0,0 +1,51 @@
+from easyocr_unstructured import Detections, EasyocrUnstructured, MemoryCache
+
+
+def test_least_recently_used_values_are_evicted():
+    value = [['word'] * 10]
+    size = MemoryCache.get_size(value)
+    cache = MemoryCache(size * 3)
+    for key in 'abc':
+        cache.put(key, value)
+    assert cache.get('a') is value
+    cache.put('d', value)
+    # b was the least recently used once a was read
+    assert cache.get('b') is None
+    assert [cache.get(key) is value for key in 'acd'] == [True, True, True]
+    assert cache.total_bytes == size * 3
+    # replacing a value doesn't count it twice
+    cache.put('a', value)
+    assert len(cache) == 3
+    assert cache.total_bytes == size * 3
+
+
+def test_values_larger_than_the_limit_are_not_cached():
+    small = [['word']]
+    large = [['word'] * 1000]
+    cache = MemoryCache(MemoryCache.get_size(small) * 2)
+    cache.put('small', small)
+    cache.put('large', large)
+    assert cache.get('large') is None
+    assert cache.get('small') is small
+    assert cache.total_bytes == MemoryCache.get_size(small)
+
+
+def test_detections_are_sized_with_their_texts():
+    detections = Detections.from_readtext([([[0, 0], [10, 0], [10, 10], [0, 10]], 'x' * 1000, 0.9)])
+    assert MemoryCache.get_size(detections) > 1000
+
+
+def test_get_groups_returns_copies(tmp_path, monkeypatch):
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 document')
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'))
+    detections = Detections.from_readtext([([[0, 0], [10, 0], [10, 10], [0, 10]], 'one', 0.9),
+                                           ([[0, 100], [10, 100], [10, 110], [0, 110]], 'two', 0.9)])
+    monkeypatch.setattr(eu, 'scan_and_store', lambda pdf_fp, hash_value, selection=None: detections)
+    expected = [list(group) for group in eu.invoke(pdf_fp)]
+    assert expected and expected[0]
+    first = eu.invoke(pdf_fp)
+    first[0].append('changed')
+    first.append(['added'])
+    assert eu.invoke(pdf_fp) == expected
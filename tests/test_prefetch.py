@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def render_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'easyocr-unstructured-render']
+
+
+@pytest.fixture
+def eu(tmp_path, monkeypatch):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'), prefetch_pages=2)
+    eu.rendered = []
+    eu.damaged = set()
+
+    def render_pages(pdf_path, first_page=None, last_page=None, dpi=None):
+        if first_page in eu.damaged:
+            raise ValueError(f'page {first_page} is damaged')
+        eu.rendered.append((first_page, last_page))
+        return [Image.new('RGB', (10, 10)) for _ in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: eu.page_count)
+    monkeypatch.setattr(eu, 'render_pages', render_pages)
+    monkeypatch.setattr(eu, 'ocr_images', lambda images: [Detections() for _ in images])
+    return eu
+
+
+def test_render_errors_reach_the_caller(tmp_path, eu):
+    eu.page_count = 6
+    eu.damaged = {5}
+    pages = eu.prefetch(eu.iter_pages('doc.pdf'))
+    assert len([next(pages) for _ in range(4)]) == 4
+    with pytest.raises(ValueError, match='page 5 is damaged'):
+        next(pages)
+    assert render_threads() == []
+
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 six pages')
+    with pytest.raises(ValueError, match='page 5 is damaged'):
+        eu.invoke(pdf_fp)
+
+
+def test_stopping_early_stops_the_render_thread(eu):
+    eu.page_count = 100
+    pages = eu.prefetch(eu.iter_pages('doc.pdf'))
+    next(pages)
+    assert len(render_threads()) == 1
+    pages.close()
+    assert render_threads() == []
+    # with two pages queued the thread is at most a chunk ahead of the caller when it stops
+    assert len(eu.rendered) <= 3
@@ -0,0 +1,36 @@
+import threading
+import time
+
+from PIL import Image
+
+from easyocr_unstructured import EasyocrUnstructured
+
+
+class ExclusiveReader:
+    """A reader that records whether two threads ever ran it at once."""
+    def __init__(self):
+        self.running = 0
+        self.overlapped = False
+
+    def readtext(self, image, **kwargs):
+        self.running += 1
+        self.overlapped = self.overlapped or self.running > 1
+        time.sleep(0.01)
+        self.running -= 1
+        return [([[0, 0], [10, 0], [10, 10], [0, 10]], 'word', 0.9)]
+
+
+def test_shared_reader_runs_one_thread_at_a_time(tmp_path):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path), gpu=False)
+    reader = ExclusiveReader()
+    EasyocrUnstructured._readers[eu.get_reader_key(eu.lang_list, eu.gpu)] = reader
+    try:
+        threads = [threading.Thread(target=eu.ocr_images, args=([Image.new('RGB', (10, 10))] * 3,))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        EasyocrUnstructured.release_readers()
+    assert not reader.overlapped
@@ -0,0 +1,38 @@
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def test_adaptive_dpi_rerenders_unsure_pages(tmp_path, monkeypatch):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'), page_cache=False, dpi=200, adaptive_dpi=100)
+    rendered = []
+
+    def render_pages(pdf_path, first_page=None, last_page=None, dpi=None):
+        dpi = dpi or eu.adaptive_dpi
+        first_page, last_page = first_page or 1, last_page or 3
+        rendered.append((first_page, last_page, dpi))
+        # the page number is the colour of the page, its size follows the resolution
+        return [Image.new('L', (dpi // 10, dpi // 10), page_number)
+                for page_number in range(first_page, last_page + 1)]
+
+    def ocr_images(images):
+        results = []
+        for image in images:
+            page_number = image.getpixel((0, 0))
+            # page 2 is only read confidently at full resolution
+            confidence = 0.2 if page_number == 2 and image.width == 10 else 0.9
+            results.append(Detections.from_readtext(
+                [([[1, 2], [5, 2], [5, 4], [1, 4]], f'page {page_number} at {image.width * 10}', confidence)]))
+        return results
+
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: 3)
+    monkeypatch.setattr(eu, 'render_pages', render_pages)
+    monkeypatch.setattr(eu, 'ocr_images', ocr_images)
+    pages = eu.scan_detections('doc.pdf').split_pages()
+
+    assert rendered[-1] == (2, 2, 200)
+    assert all(dpi == 100 for _, _, dpi in rendered[:-1])
+    assert [page.texts.tolist() for page in pages] == [['page 1 at 100'], ['page 2 at 200'], ['page 3 at 100']]
+    # pages read at adaptive_dpi are scaled up to dpi, the rerendered page is already at dpi
+    assert pages[0].coords.tolist() == pages[2].coords.tolist() == [[[2, 4], [10, 4], [10, 8], [2, 8]]]
+    assert pages[1].coords.tolist() == [[[1, 2], [5, 2], [5, 4], [1, 4]]]
@@ -0,0 +1,22 @@
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def test_empty_regions_select_every_page(tmp_path, monkeypatch):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'))
+    assert eu.get_selection(regions={}) is None
+    assert eu.get_selection(regions=[]) is None
+    assert eu.get_selection(pages=[2], regions={}) == ((2,), None)
+
+    pdf_fp = str(tmp_path / 'doc.pdf')
+    with open(pdf_fp, 'wb') as f:
+        f.write(b'%PDF-1.4 two pages')
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: 2)
+    monkeypatch.setattr(eu, 'render_pages', lambda pdf_path, first_page=None, last_page=None, dpi=None:
+                        [Image.new('RGB', (10, 10), page_number)
+                         for page_number in range(first_page or 1, (last_page or 2) + 1)])
+    monkeypatch.setattr(eu, 'ocr_images', lambda images: [Detections.from_readtext(
+        [([[0, 0], [10, 0], [10, 10], [0, 10]], f'page {image.getpixel((0, 0))[0]}', 0.9),
+         ([[0, 100], [10, 100], [10, 110], [0, 110]], 'footer', 0.9)]) for image in images])
+    assert eu.invoke(pdf_fp, regions={}) == eu.invoke(pdf_fp) != [[]]
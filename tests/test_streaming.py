@@ -0,0 +1,31 @@
+from PIL import Image
+
+from easyocr_unstructured import Detections, EasyocrUnstructured
+
+
+def test_pages_are_rendered_in_bounded_chunks(tmp_path, monkeypatch):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'), page_chunk_size=3)
+    rendered = []
+    held = []
+
+    def render_pages(pdf_path, first_page=None, last_page=None, dpi=None):
+        rendered.append((first_page, last_page))
+        return [Image.new('RGB', (10, 10), page_number) for page_number in range(first_page, last_page + 1)]
+
+    def ocr_images(images):
+        held.append(len(images))
+        return [Detections() for _ in images]
+
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: 8)
+    monkeypatch.setattr(eu, 'render_pages', render_pages)
+    monkeypatch.setattr(eu, 'ocr_images', ocr_images)
+    detections = eu.scan_detections('doc.pdf')
+
+    assert rendered == [(1, 3), (4, 6), (7, 8)]
+    assert len(detections.split_pages()) == 8
+    assert max(held) <= 3
+
+
+def test_selected_pages_are_rendered_in_runs(tmp_path, monkeypatch):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path / 'cache'), page_chunk_size=2)
+    assert eu.iter_page_runs([1, 2, 3, 5, 7, 8]) == [(1, 2), (3, 3), (5, 5), (7, 8)]
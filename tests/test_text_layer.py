@@ -0,0 +1,53 @@
+import subprocess
+
+import numpy as np
+
+from easyocr_unstructured import EasyocrUnstructured
+
+
+def bbox_page(words):
+    return ('  <page width="612.000000" height="792.000000">\n'
+            + ''.join(f'    <word xMin="{x0}" yMin="{y0}" xMax="{x1}" yMax="{y1}">{text}</word>\n'
+                      for x0, y0, x1, y1, text in words)
+            + '  </page>\n')
+
+
+def test_stamped_scans_are_still_ocred(tmp_path, monkeypatch):
+    lines = [(72, 72 + line * 30, 300, 84 + line * 30, f'word{line}_{word}')
+             for line in range(20) for word in range(3)]
+    output = ('<doc>\n' + bbox_page([(500, 760, 530, 772, '3')])
+              + bbox_page([(100, 20, 500, 40, 'CONFIDENTIAL') for _ in range(12)])
+              + bbox_page(lines) + bbox_page([]) + '</doc>\n')
+    monkeypatch.setattr(subprocess, 'run', lambda *args, **kwargs:
+                        subprocess.CompletedProcess(args, 0, stdout=output.encode('utf-8')))
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path), text_layer=True)
+    # a page number stamp, and a dozen words in one band, leave their pages to OCR
+    text_pages = eu.get_text_layer('doc.pdf')
+    assert list(text_pages) == [3]
+    assert len(text_pages[3]) == 60
+    assert EasyocrUnstructured(cache_dir=str(tmp_path), text_layer=True, text_layer_min_words=1,
+                               text_layer_min_coverage=0).get_text_layer('doc.pdf').keys() == {1, 2, 3}
+
+
+def test_vertical_coverage():
+    tops, bottoms = np.array([10.0, 15.0, 40.0, 41.0]), np.array([20.0, 18.0, 50.0, 45.0])
+    assert EasyocrUnstructured.get_vertical_coverage(tops, bottoms) == 20.0
+
+
+def test_selection_reads_only_its_pages_of_the_text_layer(tmp_path, monkeypatch):
+    lines = [(72, 72 + line * 30, 300, 84 + line * 30, f'word{line}_{word}')
+             for line in range(20) for word in range(3)]
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        first_page, last_page = int(args[args.index('-f') + 1]), int(args[args.index('-l') + 1])
+        output = '<doc>\n' + bbox_page(lines) * (last_page - first_page + 1) + '</doc>\n'
+        return subprocess.CompletedProcess(args, 0, stdout=output.encode('utf-8'))
+
+    monkeypatch.setattr(subprocess, 'run', run)
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path), text_layer=True)
+    monkeypatch.setattr(eu, 'get_page_count', lambda pdf_path: 100)
+    detections = eu.scan_detections('doc.pdf', eu.get_selection(pages=[3, 5]))
+    assert len(calls) == 1 and calls[0][calls[0].index('-f'):calls[0].index('-l') + 2] == ['-f', '3', '-l', '5']
+    assert list(detections.page_offsets) == [0, 60, 120]
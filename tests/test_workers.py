@@ -0,0 +1,23 @@
+from PIL import Image
+
+from easyocr_unstructured import EasyocrUnstructured
+
+
+def test_worker_options_keep_page_chunks(tmp_path, monkeypatch):
+    eu = EasyocrUnstructured(cache_dir=str(tmp_path), workers=2, page_chunk_size=2, page_batch_size=3,
+                             batch_max_bytes=1 << 20)
+    # the object a worker process builds to scan whole documents
+    worker = EasyocrUnstructured(**eu.get_worker_options())
+    assert (worker.page_chunk_size, worker.page_batch_size, worker.batch_max_bytes) == (2, 3, 1 << 20)
+
+    rendered = []
+
+    def render_pages(pdf_path, first_page=None, last_page=None, dpi=None):
+        rendered.append((first_page, last_page))
+        return [Image.new('RGB', (10, 10)) for _ in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(worker, 'get_page_count', lambda pdf_path: 5)
+    monkeypatch.setattr(worker, 'render_pages', render_pages)
+    monkeypatch.setattr(worker, 'ocr_images', lambda images: [[] for _ in images])
+    list(worker.iter_pages('doc.pdf'))
+    assert rendered == [(1, 2), (3, 4), (5, 5)]